@@ -40,11 +40,7 @@ def compile(
 
         sys.exit(1)
 
-    placeholders = cfg.available_placeholders()
-    for key, value in options:
-        if key in placeholders:
-            placeholder = placeholders[key]
-            cfg.deep_set(key, placeholder.cast(value))
+    cfg.set_placeholders(dict(options))
 
     if check:
         cfg.check_available_placeholders(close_app=True)
@@ -1,6 +1,9 @@
 import click
 from choixe.cli.check import check
 from choixe.cli.compile import compile
+from choixe.cli.sweep import sweep
+from choixe.cli.render import render
+from choixe.cli.spooks import spooks
 
 
 @click.group()
@@ -10,3 +13,6 @@ def choixe():
 
 choixe.add_command(check)
 choixe.add_command(compile)
+choixe.add_command(sweep)
+choixe.add_command(render)
+choixe.add_command(spooks)
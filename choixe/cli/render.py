@@ -0,0 +1,130 @@
+from typing import Any, Dict, List, Sequence, Tuple
+import click
+
+# Per-process state of the render workers: (template, folder, format, defaults)
+_WORKER_STATE = None
+
+
+def _init_worker(
+    base: dict, filename: str, output_folder: str, fmt: str, replace_defaults: bool
+):
+    from choixe.configurations import XConfig
+    from pathlib import Path
+
+    global _WORKER_STATE
+    cfg = XConfig.from_dict(base, no_deep_parse=True)
+    cfg._filename = Path(filename)
+    _WORKER_STATE = (cfg.compile_template(), output_folder, fmt, replace_defaults)
+
+
+def _materialize(tasks: Sequence[Tuple[int, Dict[str, Any]]]) -> List[dict]:
+    """Renders and serializes a batch of table rows
+
+    :param tasks: list of (row index, row values)
+    :type tasks: Sequence[Tuple[int, Dict[str, Any]]]
+    :return: manifest entries
+    :rtype: List[dict]
+    """
+    from choixe.cli.utils import serialize_entry
+
+    template, output_folder, fmt, replace_defaults = _WORKER_STATE
+    rows = [row for _, row in tasks]
+    cfgs = template.render_table(rows, replace_defaults=replace_defaults)
+    return [
+        serialize_entry(cfg, index, "render", output_folder, fmt)
+        for (index, _), cfg in zip(tasks, cfgs)
+    ]
+
+
+@click.command("render", help="Render Configuration file for each row of a table")
+@click.option(
+    "-c", "--configuration_file", required=True, help="Input configuration file."
+)
+@click.option(
+    "-t",
+    "--table",
+    required=True,
+    help="CSV file with a column for each placeholder name.",
+)
+@click.option(
+    "-o", "--output_folder", required=True, help="Output folder for rendered files."
+)
+@click.option(
+    "--defaults/--nodefaults",
+    default=False,
+    help="Replace placeholders not found in the table with their default values.",
+)
+@click.option(
+    "-w", "--workers", default=1, type=int, help="Number of worker processes."
+)
+@click.option(
+    "--format",
+    "fmt",
+    default="yml",
+    type=click.Choice(["yml", "yaml", "json", "jsonl"]),
+    help="Output format, jsonl writes all the configurations in a single file.",
+)
+@click.option("--batch_size", default=64, type=int, help="Rows rendered per task.")
+def render(
+    configuration_file: str,
+    table: str,
+    output_folder: str,
+    defaults: bool,
+    workers: int,
+    fmt: str,
+    batch_size: int,
+):
+
+    from choixe.configurations import XConfig
+    from choixe.cli.utils import make_batches, collect_entries, run_batches
+    from pathlib import Path
+    import csv
+    import json
+    import rich
+    import sys
+
+    try:
+        cfg = XConfig(filename=configuration_file)
+    except Exception as e:
+        rich.print(f"[red]Invalid configuration file: {e}[/red]")
+        sys.exit(1)
+
+    output_folder = Path(output_folder)
+    output_folder.mkdir(parents=True, exist_ok=True)
+
+    try:
+        with open(table, "r", newline="") as f:
+            # Rows are streamed, only a bounded number of batches is in memory
+            tasks = enumerate(csv.DictReader(f))
+            init_args = (
+                XConfig.decode(cfg.to_dict()),
+                str(configuration_file),
+                str(output_folder),
+                fmt,
+                defaults,
+            )
+            results = run_batches(
+                _materialize,
+                make_batches(tasks, max(batch_size, 1)),
+                workers,
+                _init_worker,
+                init_args,
+            )
+            manifest = collect_entries(results, output_folder, fmt, "render.jsonl")
+    except (OSError, ValueError) as e:
+        rich.print(f"[red]Invalid table: {e}[/red]")
+        sys.exit(1)
+
+    with open(output_folder / "manifest.json", "w") as f:
+        json.dump(
+            {
+                "configuration": str(configuration_file),
+                "table": str(table),
+                "variants": manifest,
+            },
+            f,
+            indent=2,
+        )
+    rich.print(
+        f"[green]{len(manifest)} configurations saved to {output_folder}[/green]"
+    )
@@ -0,0 +1,33 @@
+from typing import Sequence
+import click
+
+
+@click.command("spooks", help="Build the index of the Spooks defined in some modules")
+@click.option(
+    "-m",
+    "--module",
+    "modules",
+    required=True,
+    multiple=True,
+    help="Module or package to index, packages are indexed recursively.",
+)
+@click.option("-o", "--output_file", required=True, help="Output JSON index file.")
+@click.option(
+    "--recursive/--norecursive", default=True, help="Index also package submodules."
+)
+def spooks(modules: Sequence[str], output_file: str, recursive: bool):
+
+    from choixe.spooks import MetaSpook
+    import json
+    import rich
+    import sys
+
+    try:
+        index = MetaSpook.build_index(list(modules), recursive=recursive)
+    except Exception as e:
+        rich.print(f"[red]Unable to index modules: {e}[/red]")
+        sys.exit(1)
+
+    with open(output_file, "w") as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+    rich.print(f"[green]{len(index)} spooks indexed in {output_file}[/green]")
@@ -0,0 +1,164 @@
+from typing import List, Sequence, Tuple
+import click
+
+# Per-process state of the sweep workers: (base XConfig, sweep axes, folder, format)
+_WORKER_STATE = None
+
+
+def _init_worker(base: dict, filename: str, output_folder: str, fmt: str):
+    from choixe.configurations import XConfig
+    from pathlib import Path
+
+    global _WORKER_STATE
+    cfg = XConfig.from_dict(base, no_deep_parse=True)
+    # Imports among sweep options are relative to the source file
+    cfg._filename = Path(filename)
+    _WORKER_STATE = (cfg, cfg.sweep_axes(), output_folder, fmt)
+
+
+def _materialize(tasks: Sequence[Tuple[int, List[int]]]) -> List[dict]:
+    """Builds and serializes a batch of sweep variants
+
+    :param tasks: list of (sweep index, per-axis option indices)
+    :type tasks: Sequence[Tuple[int, List[int]]]
+    :return: manifest entries
+    :rtype: List[dict]
+    """
+    from choixe.cli.utils import serialize_entry
+
+    cfg, axes, output_folder, fmt = _WORKER_STATE
+    return [
+        serialize_entry(cfg._sweep_variant(axes, d), i, "sweep", output_folder, fmt)
+        for i, d in tasks
+    ]
+
+
+@click.command("sweep", help="Sweep Configuration file")
+@click.option(
+    "-c", "--configuration_file", required=True, help="Input configuration file."
+)
+@click.option(
+    "-o", "--output_folder", required=True, help="Output folder for sweeped files."
+)
+@click.option(
+    "--shard",
+    default="0/1",
+    type=str,
+    help="Build only the shard K/N of the sweep (e.g. '2/8' on the third of 8 nodes).",
+)
+@click.option(
+    "--sample",
+    default=None,
+    type=int,
+    help="Build only SAMPLE combinations drawn from the sweep instead of all of them.",
+)
+@click.option(
+    "--method",
+    default="random",
+    type=click.Choice(["random", "lhs", "sobol"]),
+    help="Sampling method used with --sample.",
+)
+@click.option("--seed", default=None, type=int, help="Sampling random seed.")
+@click.option(
+    "--constraint",
+    "constraints",
+    multiple=True,
+    help="Expression over dotted keys pruning invalid combinations (e.g. 'a.b < c').",
+)
+@click.option(
+    "-w", "--workers", default=1, type=int, help="Number of worker processes."
+)
+@click.option(
+    "--format",
+    "fmt",
+    default="yml",
+    type=click.Choice(["yml", "yaml", "json", "jsonl"]),
+    help="Output format, jsonl writes all the variants in a single file.",
+)
+@click.option(
+    "--batch_size", default=64, type=int, help="Variants built per worker task."
+)
+def sweep(
+    configuration_file: str,
+    output_folder: str,
+    shard: str,
+    sample: int,
+    method: str,
+    seed: int,
+    constraints: Sequence[str],
+    workers: int,
+    fmt: str,
+    batch_size: int,
+):
+
+    from choixe.configurations import XConfig
+    from choixe.sweepers import SweepSampler
+    from choixe.cli.utils import make_batches, collect_entries, run_batches
+    from pathlib import Path
+    import json
+    import rich
+    import sys
+
+    try:
+        k, n = [int(x) for x in shard.split("/")]
+    except ValueError:
+        rich.print(f"[red]Invalid shard '{shard}', expected format is K/N[/red]")
+        sys.exit(1)
+
+    try:
+        cfg = XConfig(filename=configuration_file)
+    except Exception as e:
+        rich.print(f"[red]Invalid configuration file: {e}[/red]")
+        sys.exit(1)
+
+    if n < 1 or not 0 <= k < n:
+        rich.print(f"[red]Invalid shard '{shard}'[/red]")
+        sys.exit(1)
+
+    try:
+        axes = cfg.sweep_axes()
+        if sample is not None:
+            if n > 1 and seed is None:
+                rich.print("[red]Sharded sampling requires a --seed[/red]")
+                sys.exit(1)
+            if len(constraints) > 0:
+                rich.print("[red]--constraint can not be used with --sample[/red]")
+                sys.exit(1)
+            sizes = [len(axis[0][1].values) for axis in axes]
+            samples = SweepSampler.sample(sizes, sample, method=method, seed=seed)
+            # Samples are named after their position, shards keep one every n
+            tasks = ((k + i * n, d) for i, d in enumerate(samples[k::n].tolist()))
+        else:
+            # Variants are named after their sweep index, also with constraints
+            tasks = cfg._sweep_digits(axes, k, n, constraints=list(constraints))
+        batches = make_batches(tasks, max(batch_size, 1))
+
+        output_folder = Path(output_folder)
+        output_folder.mkdir(parents=True, exist_ok=True)
+        suffix = "" if n == 1 else f"_{k}_{n}"
+        init_args = (
+            XConfig.decode(cfg.to_dict()),
+            str(configuration_file),
+            str(output_folder),
+            fmt,
+        )
+
+        results = run_batches(_materialize, batches, workers, _init_worker, init_args)
+        manifest = collect_entries(results, output_folder, fmt, f"sweep{suffix}.jsonl")
+    except ValueError as e:
+        rich.print(f"[red]Invalid sweep: {e}[/red]")
+        sys.exit(1)
+
+    with open(output_folder / f"manifest{suffix}.json", "w") as f:
+        json.dump(
+            {
+                "configuration": str(configuration_file),
+                "shard": [k, n],
+                "variants": manifest,
+            },
+            f,
+            indent=2,
+        )
+    rich.print(
+        f"[green]{len(manifest)} configurations saved to {output_folder}[/green]"
+    )
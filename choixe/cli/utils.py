@@ -0,0 +1,114 @@
+from typing import Any, Callable, Iterable, Iterator, List
+from pathlib import Path
+
+
+def make_batches(tasks: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Groups tasks in lists of `size` elements, lazily
+
+    :param tasks: tasks to group
+    :type tasks: Iterable[Any]
+    :param size: batch size
+    :type size: int
+    :return: iterator over batches
+    :rtype: Iterator[List[Any]]
+    """
+    batch = []
+    for task in tasks:
+        batch.append(task)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if len(batch) > 0:
+        yield batch
+
+
+def run_batches(
+    fn: Callable[[List[Any]], List[dict]],
+    batches: Iterable[List[Any]],
+    workers: int,
+    initializer: Callable,
+    init_args: tuple,
+) -> Iterator[List[dict]]:
+    """Runs `fn` on each batch keeping the batches order, on a process pool if
+    `workers` > 1. Only a bounded window of batches is pending, so that tasks can be
+    enumerated lazily
+
+    :param fn: function to run on each batch
+    :type fn: Callable[[List[Any]], List[dict]]
+    :param batches: batches of tasks
+    :type batches: Iterable[List[Any]]
+    :param workers: number of worker processes
+    :type workers: int
+    :param initializer: function initializing each worker state
+    :type initializer: Callable
+    :param init_args: initializer arguments
+    :type init_args: tuple
+    :return: iterator over results of each batch
+    :rtype: Iterator[List[dict]]
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from collections import deque
+
+    if workers <= 1:
+        initializer(*init_args)
+        yield from map(fn, batches)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=initializer, initargs=init_args
+    ) as executor:
+        pending = deque()
+        for batch in batches:
+            pending.append(executor.submit(fn, batch))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while len(pending) > 0:
+            yield pending.popleft().result()
+
+
+def serialize_entry(
+    cfg: "XConfig", index: int, prefix: str, output_folder: str, fmt: str  # noqa: F821
+) -> dict:
+    """Saves a configuration to `output_folder` with a deterministic name, or
+    serializes it to a JSON line for jsonl format
+
+    :return: manifest entry, with the serialized line in 'content' for jsonl format
+    :rtype: dict
+    """
+    import json
+
+    entry = {"index": index, "fingerprint": cfg.fingerprint()}
+    if fmt == "jsonl":
+        entry["content"] = json.dumps(cfg.encode(cfg.to_dict()))
+    else:
+        entry["file"] = f"{prefix}_{str(index).zfill(5)}.{fmt}"
+        cfg.save_to(Path(output_folder) / entry["file"])
+    return entry
+
+
+def collect_entries(
+    results: Iterable[List[dict]], output_folder: Path, fmt: str, jsonl_name: str
+) -> List[dict]:
+    """Collects manifest entries in order, writing the JSON lines to `jsonl_name`
+    for jsonl format
+
+    :return: manifest entries
+    :rtype: List[dict]
+    """
+
+    manifest = []
+    jsonl_file = None
+    if fmt == "jsonl":
+        jsonl_file = open(Path(output_folder) / jsonl_name, "w")
+    try:
+        for entries in results:
+            for entry in entries:
+                if jsonl_file is not None:
+                    jsonl_file.write(entry.pop("content") + "\n")
+                    entry["file"] = jsonl_name
+                    entry["line"] = len(manifest)
+                manifest.append(entry)
+    finally:
+        if jsonl_file is not None:
+            jsonl_file.close()
+    return manifest
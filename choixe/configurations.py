@@ -1,22 +1,50 @@
 import os
+import re
+from choixe.directives import DirectiveFactory
 from choixe.importers import Importer, ImporterType
+from choixe.interpolations import Interpolation
 from choixe.placeholders import Placeholder, PlaceholderType
+from choixe.references import Reference
 from box.from_file import converters
 from box import box_from_file, Box, BoxList
 import numpy as np
 import pydash
-from typing import Any, Dict, List, Sequence, Tuple, Union
+import json
+import hashlib
+from collections.abc import Sequence as AbstractSequence
+from typing import (
+    Any,
+    Callable,
+    Container,
+    Dict,
+    Iterator,
+    List,
+    Sequence,
+    Tuple,
+    Union,
+)
 from schema import Schema
 from pathlib import Path
 import copy
+import datetime
+import functools
 
-from choixe.sweepers import Sweeper
+from choixe.sweepers import (
+    SweepChain,
+    Sweeper,
+    SweepConstraint,
+    SweepSampler,
+    SweepSamplingMethod,
+)
 
 
 class XConfig(Box):
     KNOWN_EXTENSIONS = converters.keys()
     PRIVATE_KEYS = ["_filename", "_schema"]
 
+    # Key of an inline placeholder in `available_placeholders` (e.g. 'a.b[0]')
+    INLINE_KEY = re.compile(r"^(.+)\[(\d+)\]$")
+
     def __init__(self, filename: str = None, **kwargs):
         """Creates a XConfig object from configuration file
         :param filename: configuration file [yaml, json, toml], defaults to None
@@ -59,6 +87,21 @@ class XConfig(Box):
         new_xconfig._schema = self._schema
         return new_xconfig
 
+    def fingerprint(self) -> str:
+        """Content fingerprint: a stable hash of the configuration tree, independent of
+        keys order and ignoring private keys. Equal configurations have equal fingerprints
+
+        :return: hex digest of the canonical tree
+        :rtype: str
+        """
+        canonical = json.dumps(
+            self.encode(self.to_dict(discard_private_qualifiers=True)),
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
     @property
     def root_content(self) -> Union[None, Any]:
         """Returns the 'value' if configuration is a single 'key'/'value' pair.
@@ -113,11 +156,11 @@ class XConfig(Box):
         filename = Path(filename)
         data = self.to_dict()
         if "yml" in filename.suffix.lower() or "yaml" in filename.suffix.lower():
-            Box(self.decode(data)).to_yaml(filename=filename)
+            Box(self.encode(data, dates=False)).to_yaml(filename=filename)
         elif "json" in filename.suffix.lower():
-            Box(self.decode(data)).to_json(filename=filename)
+            Box(self.encode(data)).to_json(filename=filename)
         elif "toml" in filename.suffix.lower():
-            Box(self.decode(data)).to_toml(filename=filename)
+            Box(self.encode(data, dates=False)).to_toml(filename=filename)
         else:
             raise NotImplementedError(
                 f"Extension {filename.suffix.lower()} not supported yet!"
@@ -145,6 +188,30 @@ class XConfig(Box):
         else:
             return data
 
+    @classmethod
+    def encode(cls, data: any, dates: bool = True) -> any:
+        """Decodes data for text serialization, converting to str the values without a
+        plain representation: paths and, if `dates` is TRUE, dates (ISO format)
+
+        :param data: data to encode
+        :type data: any
+        :param dates: FALSE to keep dates, for formats supporting them (e.g. yaml),
+        defaults to True
+        :type dates: bool, optional
+        :return: encoded data
+        :rtype: any
+        """
+        data = cls.decode(data)
+        if isinstance(data, list):
+            return [cls.encode(x, dates=dates) for x in data]
+        elif isinstance(data, dict):
+            return {k: cls.encode(x, dates=dates) for k, x in data.items()}
+        elif isinstance(data, Path):
+            return str(data)
+        elif dates and isinstance(data, datetime.date):
+            return data.isoformat()
+        return data
+
     def chunks_as_lists(
         self, discard_private_qualifiers: bool = True
     ) -> Sequence[Tuple[List[str], Any]]:
@@ -242,7 +309,8 @@ class XConfig(Box):
             self.deep_set(key, new_value, only_valid_keys=not full_merge)
 
     def replace_variable(self, old_value: str, new_value: str):
-        """Replaces target variables with custom new value
+        """Replaces target variables with custom new value, also inside strings with
+        inline placeholders (e.g. '/data/@str(dataset)/train')
         :param old_value: value to replace
         :type old_value: str
         :param new_value: new key value
@@ -254,6 +322,10 @@ class XConfig(Box):
             if p is not None and p.is_valid():
                 if old_value == p.name:
                     pydash.set_(self, k, p.cast(new_value))
+                continue
+            interpolation = Interpolation.from_string(v)
+            if interpolation is not None and old_value in interpolation.names:
+                pydash.set_(self, k, interpolation.render({old_value: new_value}))
 
     def replace_variables_map(self, m: dict, replace_defaults: bool = False):
         """Replace target old variables with new values represented as dict
@@ -273,6 +345,17 @@ class XConfig(Box):
                 if p.default_value is not None:
                     self.replace_variable(p.name, p.default_value)
 
+    def compile_template(self) -> "XConfigTemplate":  # noqa: F821
+        """Compiles the current XConfig into a template recording the placeholder
+        locations once, to be rendered many times with different values
+
+        :return: compiled template
+        :rtype: XConfigTemplate
+        """
+        from choixe.templates import XConfigTemplate
+
+        return XConfigTemplate(self)
+
     def deep_parse(self, replace_environment_variables: bool = False):
         """Deep visit of dictionary replacing filename values with a new XConfig object recusively
 
@@ -281,43 +364,369 @@ class XConfig(Box):
         """
         chunks = self.chunks_as_lists()
         self._deep_parse_for_importers(chunks)
+        self._deep_parse_for_references(chunks)
         if replace_environment_variables:
             self._deep_parse_for_environ(chunks)
 
-    def sweep(self) -> Sequence["XConfig"]:
+    def sweep_sites(self) -> Sequence[Tuple[List[str], Sweeper]]:
+        """Retrieves the SWEEP directives of the current XConfig in visit order. Each site
+        is a pair (key, sweeper) where key is a list of str pydash key
+
+        :return: list of found (key, sweeper) pairs
+        :rtype: Sequence[Tuple[List[str], Sweeper]]
+        """
+
+        sites = []
+        for chunk_name, value in self.chunks_as_lists():
+            if not isinstance(value, str):
+                continue
+            sweeper = DirectiveFactory.build_consumer_from_string(value)
+            if isinstance(sweeper, Sweeper) and sweeper.is_valid():
+                # Empty sweeps do not produce any variant, skip them
+                if len(sweeper.values) > 0:
+                    sites.append((chunk_name, self._sweep_imports(sweeper)))
+        return sites
+
+    def _sweep_imports(self, sweeper: Sweeper) -> Sweeper:
+        """Resolves the importer directives among the options of a SWEEP
+        (e.g. '@sweep("@import(resnet.yml)", "@import(vgg.yml)")'). Each imported file is
+        parsed once and cached, if it contains SWEEP directives its option is expanded
+        into all of its sweeped variants, built on demand
+
+        :param sweeper: source sweeper
+        :type sweeper: Sweeper
+        :return: the same sweeper if no importer found, otherwise a sweeper with resolved
+        values
+        :rtype: Sweeper
+        """
+
+        sequences, literals, imported = [], [], False
+        for value in sweeper.values:
+            importer = Importer.from_string(value) if isinstance(value, str) else None
+            if importer is None or not importer.is_valid():
+                literals.append(value)
+                continue
+
+            imported = True
+            filename = self._importer_filename(importer).resolve()
+            if len(literals) > 0:
+                sequences.append(literals)
+                literals = []
+            sequences.append(
+                _load_sweep_import(str(filename), filename.stat().st_mtime_ns, value)
+            )
+
+        if not imported:
+            return sweeper
+        if len(literals) > 0:
+            sequences.append(literals)
+        return sweeper.with_values(SweepChain(sequences))
+
+    def sweep_axes(self) -> Sequence[Sequence[Tuple[List[str], Sweeper]]]:
+        """Groups the SWEEP sites in axes. Sites sharing the same `group` argument
+        (e.g. '@sweep(1, 2, group=lr)') advance together in a single axis (zip),
+        each ungrouped site is an axis on its own. Sweep is the product of the axes
+
+        :raises ValueError: if sites of the same group have different lengths
+        :return: list of axes, each one a list of (key, sweeper) pairs
+        :rtype: Sequence[Sequence[Tuple[List[str], Sweeper]]]
+        """
+
+        axes, groups = [], {}
+        for chunk_name, sweeper in self.sweep_sites():
+            group = sweeper.group
+            if group is None:
+                axes.append([(chunk_name, sweeper)])
+            elif group in groups:
+                axis = groups[group]
+                if len(axis[0][1].values) != len(sweeper.values):
+                    raise ValueError(
+                        f"Sweep group '{group}' has sites of different lengths: "
+                        f"{'.'.join(axis[0][0])} and {'.'.join(chunk_name)}"
+                    )
+                axis.append((chunk_name, sweeper))
+            else:
+                groups[group] = [(chunk_name, sweeper)]
+                axes.append(groups[group])
+        return axes
+
+    def sweep_length(self) -> int:
+        """Number of XConfig produced by a full sweep, computed without building them
+
+        :return: number of sweep combinations
+        :rtype: int
+        """
+        return self._sweep_total(self.sweep_axes())
+
+    def sweep_at(self, index: int) -> "XConfig":
+        """Builds the i-th XConfig of the sweep directly, without building the previous ones.
+        The ordering is the same of `sweep()`, with the last SWEEP varying fastest
+
+        :param index: index of the combination, negative values count from the end
+        :type index: int
+        :raises IndexError: if index is out of the sweep range
+        :return: built XConfig
+        :rtype: XConfig
+        """
+
+        axes = self.sweep_axes()
+        total = self._sweep_total(axes)
+        if index < 0:
+            index += total
+        if not 0 <= index < total:
+            raise IndexError(f"Sweep index {index} out of range [0, {total})")
+        return self._sweep_variant(axes, self._sweep_unravel(index, axes))
+
+    def iter_sweep(
+        self,
+        shard: int = 0,
+        num_shards: int = 1,
+        constraints: Sequence[Union[str, Callable, SweepConstraint]] = None,
+        skip: Container[str] = None,
+    ) -> Iterator["XConfig"]:
+        """Lazily iterates over the XConfig built sweeping out all the SWEEP placeholders.
+        Combinations can be split in `num_shards` disjoint shards, the k-th shard yields
+        only combinations whose index is k modulo `num_shards`.
+        Constraints prune invalid combinations before any XConfig is built, each one
+        is checked as soon as all the keys it references are bound
+
+        :param shard: index of the shard to iterate, defaults to 0
+        :type shard: int, optional
+        :param num_shards: total number of shards, defaults to 1
+        :type num_shards: int, optional
+        :param constraints: list of constraints as expressions over dotted keys
+        (e.g. 'model.hidden % model.heads == 0'), callables receiving a dict of the swept
+        values or SweepConstraint objects, defaults to None
+        :type constraints: Sequence[Union[str, Callable, SweepConstraint]], optional
+        :param skip: fingerprints of XConfig to skip (e.g. a FingerprintIndex of already
+        executed variants), defaults to None
+        :type skip: Container[str], optional
+        :raises ValueError: if shard is not in [0, num_shards)
+        :return: iterator over built XConfig s
+        :rtype: Iterator[XConfig]
+        """
+
+        axes = self.sweep_axes()
+        for _, digits in self._sweep_digits(axes, shard, num_shards, constraints):
+            cfg = self._sweep_variant(axes, digits)
+            if skip is not None and cfg.fingerprint() in skip:
+                continue
+            yield cfg
+
+    def sweep(
+        self,
+        constraints: Sequence[Union[str, Callable, SweepConstraint]] = None,
+        skip: Container[str] = None,
+    ) -> Sequence["XConfig"]:
         """Returns a list of XConfig built from the current XConfig,
         sweeping out all the SWEEP placeholders and replacing them with their values
 
+        :param constraints: constraints pruning invalid combinations, see `iter_sweep`
+        :type constraints: Sequence[Union[str, Callable, SweepConstraint]], optional
+        :param skip: fingerprints of XConfig to skip, see `iter_sweep`
+        :type skip: Container[str], optional
         :return: list of built XConfig s
         :rtype: XConfig
         """
 
-        sweeped_cfgs: Sequence[XConfig] = []
-        chunks = self.chunks_as_lists()
-        for chunk_name, value in chunks:
-            if not isinstance(value, str):
-                continue
-            sweeper = Sweeper.from_string(value)
-            if sweeper is not None:
-                if sweeper.is_valid():
-                    options = sweeper.options
-                    for o in options:
-                        cfg = self.copy()
-                        cfg.deep_set(chunk_name, eval(o))
-                        sweeped_cfgs.append(cfg)
-            # Stop iterations on the first SWEEP
-            if len(sweeped_cfgs) > 0:
-                break
-
-        if len(sweeped_cfgs) == 0:
-            return [self.copy()]
-
-        # Repeat Sweep for each sweeped cfg
-        whole_sweeped_cgs = []
-        for cfg in sweeped_cfgs:
-            ss = cfg.sweep()
-            whole_sweeped_cgs += ss
-        return whole_sweeped_cgs
+        return list(self.iter_sweep(constraints=constraints, skip=skip))
+
+    def sweep_set(
+        self,
+        shard: int = 0,
+        num_shards: int = 1,
+        constraints: Sequence[Union[str, Callable, SweepConstraint]] = None,
+    ) -> "SweepSet":
+        """Delta-encoded sweep: returns a SweepSet storing the current XConfig once plus
+        the swept values of each combination, XConfig are built only on demand.
+        Arguments are the same of `iter_sweep`
+
+        :return: built SweepSet
+        :rtype: SweepSet
+        """
+
+        axes = self.sweep_axes()
+        overrides = []
+        for _, digits in self._sweep_digits(axes, shard, num_shards, constraints):
+            # Values are copied, the set must not share sweep options or imports
+            overrides.append(
+                {
+                    ".".join(chunk_name): copy.deepcopy(sweeper.values[digit])
+                    for axis, digit in zip(axes, digits)
+                    for chunk_name, sweeper in axis
+                }
+            )
+        return SweepSet(self.copy(), overrides)
+
+    def sample_sweep(
+        self,
+        n: int,
+        method: Union[str, SweepSamplingMethod] = SweepSamplingMethod.RANDOM,
+        seed: int = None,
+        shard: int = 0,
+        num_shards: int = 1,
+    ) -> Sequence["XConfig"]:
+        """Returns a list of `n` XConfig built drawing combinations of the SWEEP
+        placeholders, without enumerating the whole sweep grid. As for `iter_sweep`,
+        samples can be split in shards: only the XConfig of the selected shard are built
+
+        :param n: number of XConfig to build
+        :type n: int
+        :param method: sampling method [random, lhs, sobol], defaults to random
+        :type method: Union[str, SweepSamplingMethod], optional
+        :param seed: random seed, it must be the same on all shards, defaults to None
+        :type seed: int, optional
+        :param shard: index of the shard to build, defaults to 0
+        :type shard: int, optional
+        :param num_shards: total number of shards, defaults to 1
+        :type num_shards: int, optional
+        :raises ValueError: if shard is not in [0, num_shards)
+        :return: list of built XConfig s
+        :rtype: Sequence[XConfig]
+        """
+
+        if num_shards < 1 or not 0 <= shard < num_shards:
+            raise ValueError(f"Invalid shard {shard}/{num_shards}")
+
+        axes = self.sweep_axes()
+        sizes = [len(axis[0][1].values) for axis in axes]
+        samples = SweepSampler.sample(sizes, n, method=method, seed=seed)
+        # Plain ints, numpy scalars must not reach lazy sweeps and the built XConfig
+        return [
+            self._sweep_variant(axes, digits)
+            for digits in samples[shard::num_shards].tolist()
+        ]
+
+    @classmethod
+    def _sweep_total(cls, axes: Sequence[Sequence[Tuple[List[str], Sweeper]]]) -> int:
+        total = 1
+        for axis in axes:
+            total *= len(axis[0][1].values)
+        return total
+
+    @classmethod
+    def _sweep_unravel(
+        cls, index: int, axes: Sequence[Sequence[Tuple[List[str], Sweeper]]]
+    ) -> List[int]:
+        """Converts a sweep index into per-axis option indices (mixed radix, last axis fastest)
+
+        :param index: sweep index
+        :type index: int
+        :param axes: sweep axes
+        :type axes: Sequence[Sequence[Tuple[List[str], Sweeper]]]
+        :return: list of option indices, one for each axis
+        :rtype: List[int]
+        """
+
+        digits = []
+        for axis in reversed(axes):
+            index, digit = divmod(index, len(axis[0][1].values))
+            digits.append(digit)
+        return digits[::-1]
+
+    def _sweep_digits(
+        self,
+        axes: Sequence[Sequence[Tuple[List[str], Sweeper]]],
+        shard: int = 0,
+        num_shards: int = 1,
+        constraints: Sequence[Union[str, Callable, SweepConstraint]] = None,
+    ) -> Iterator[Tuple[int, List[int]]]:
+        """Iterates over the per-axis option indices of the selected shard, along with
+        their sweep index (the same of `sweep_at`). With constraints, shards split the
+        valid combinations, but indices still refer to the whole sweep
+
+        :raises ValueError: if shard is not in [0, num_shards)
+        :return: iterator over pairs (sweep index, per-axis option indices)
+        :rtype: Iterator[Tuple[int, List[int]]]
+        """
+
+        if num_shards < 1 or not 0 <= shard < num_shards:
+            raise ValueError(f"Invalid shard {shard}/{num_shards}")
+
+        if not constraints:
+            for index in range(shard, self._sweep_total(axes), num_shards):
+                yield index, self._sweep_unravel(index, axes)
+            return
+
+        pruned_digits = self._sweep_pruned_digits(axes, constraints)
+        for position, (index, digits) in enumerate(pruned_digits):
+            if position % num_shards == shard:
+                yield index, digits
+
+    def _sweep_pruned_digits(
+        self,
+        axes: Sequence[Sequence[Tuple[List[str], Sweeper]]],
+        constraints: Sequence[Union[str, Callable, SweepConstraint]],
+    ) -> Iterator[Tuple[int, List[int]]]:
+        """Depth-first enumeration of the per-axis option indices, skipping whole
+        subtrees of the product as soon as a constraint fails. The sweep index of each
+        combination (mixed radix, last axis fastest) is computed along the visit
+
+        :param axes: sweep axes
+        :type axes: Sequence[Sequence[Tuple[List[str], Sweeper]]]
+        :param constraints: constraints to check
+        :type constraints: Sequence[Union[str, Callable, SweepConstraint]]
+        :raises ValueError: if a constraint references a not existing key
+        :return: iterator over pairs (sweep index, valid option indices, one for each
+        axis)
+        :rtype: Iterator[Tuple[int, List[int]]]
+        """
+
+        axes_keys = [[".".join(k) for k, _ in axis] for axis in axes]
+        key_to_axis = {k: i for i, keys in enumerate(axes_keys) for k in keys}
+
+        # Constraints are checked at the depth of their deepest referenced axis
+        bound, depths = {}, [[] for _ in axes]
+        for constraint in map(SweepConstraint.build, constraints):
+            depth = len(axes) - 1 if constraint.keys is None else -1
+            for key in constraint.keys or []:
+                if key in key_to_axis:
+                    depth = max(depth, key_to_axis[key])
+                elif pydash.has(self, key):
+                    bound[key] = pydash.get(self, key)
+                else:
+                    raise ValueError(f"Sweep constraint key '{key}' not found")
+            if depth >= 0:
+                depths[depth].append(constraint)
+            elif not constraint.check(bound):
+                return
+
+        if len(axes) == 0:
+            yield 0, []
+            return
+
+        digits = [0] * len(axes)
+
+        def _visit(depth: int, prefix: int) -> Iterator[Tuple[int, List[int]]]:
+            sweepers = [sweeper for _, sweeper in axes[depth]]
+            size = len(sweepers[0].values)
+            for digit in range(size):
+                for key, sweeper in zip(axes_keys[depth], sweepers):
+                    bound[key] = sweeper.values[digit]
+                if all(c.check(bound) for c in depths[depth]):
+                    digits[depth] = digit
+                    index = prefix * size + digit
+                    if depth == len(axes) - 1:
+                        yield index, list(digits)
+                    else:
+                        yield from _visit(depth + 1, index)
+
+        yield from _visit(0, 0)
+
+    def _sweep_variant(
+        self,
+        axes: Sequence[Sequence[Tuple[List[str], Sweeper]]],
+        digits: Sequence[int],
+    ) -> "XConfig":
+        cfg = self.copy()
+        for axis, digit in zip(axes, digits):
+            for chunk_name, sweeper in axis:
+                value = sweeper.values[digit]
+                # Imported options are shared by all the variants
+                if isinstance(value, (dict, list)):
+                    value = copy.deepcopy(value)
+                cfg.deep_set(chunk_name, value)
+        return cfg
 
     def _deep_parse_for_importers(self, chunks: Sequence[Tuple[Union[str, list], Any]]):
         """Deep visit of dictionary replacing filename values with a new XConfig object recusively
@@ -331,18 +740,115 @@ class XConfig(Box):
         for chunk_name, value in chunks:
             if not isinstance(value, str):
                 continue
-            importer = Importer.from_string(value)
-            if importer is not None:
+            importer = DirectiveFactory.build_consumer_from_string(value)
+            if isinstance(importer, Importer):
                 if importer.is_valid():
+                    p = self._importer_filename(importer)
+                    self._import_external_file(importer, chunk_name, p)
+
+    def _deep_parse_for_references(
+        self, chunks: Sequence[Tuple[Union[str, list], Any]]
+    ):
+        """Deep visit of dictionary replacing REF directives with the referenced values.
+        References are resolved in dependency order and each referenced key is resolved
+        once. Every reference gets its own deep copy of the referenced subtree, only
+        immutable leaves (strings, numbers) are shared: references shrink the source
+        files, not the resident memory. Sharing whole subtrees would save memory, but
+        any write through Box attributes or items (including in-place list updates)
+        would silently change the original and all the other references
 
-                    p = Path(importer.path)
-                    if self._filename is not None and not p.is_absolute():
-                        p = self._filename.parent / p
+        :param chunks: chunks to visit
+        :type chunks: Sequence[Tuple[Union[str, list], Any]]
+        :raises ValueError: if references form a cycle
+        :raises KeyError: if a referenced key is not found
+        """
 
-                    if p.exists():
-                        self._import_external_file(importer, chunk_name, p)
-                    else:
-                        raise OSError(f"File {p} not found!")
+        references = {}
+        for chunk_name, value in chunks:
+            if not isinstance(value, str):
+                continue
+            reference = DirectiveFactory.build_consumer_from_string(value)
+            if isinstance(reference, Reference) and reference.is_valid():
+                references[tuple(chunk_name)] = tuple(reference.keys)
+
+        if len(references) == 0:
+            return
+
+        resolved, visiting = {}, []
+        for site in references:
+            self._resolve_reference(site, references, resolved, visiting)
+
+    def _resolve_reference(
+        self,
+        site: Tuple[str, ...],
+        references: Dict[Tuple[str, ...], Tuple[str, ...]],
+        resolved: Dict[Tuple[str, ...], Any],
+        visiting: List[Tuple[str, ...]],
+    ) -> Any:
+        """Resolves the REF directive at a given key after all its dependencies: the
+        references inside the referenced subtree or along the referenced key
+
+        :param site: key of the REF directive
+        :type site: Tuple[str, ...]
+        :param references: map of REF keys -> referenced keys
+        :type references: Dict[Tuple[str, ...], Tuple[str, ...]]
+        :param resolved: memo of resolved REF keys -> values
+        :type resolved: Dict[Tuple[str, ...], Any]
+        :param visiting: stack of REF keys being resolved
+        :type visiting: List[Tuple[str, ...]]
+        :raises ValueError: if references form a cycle
+        :raises KeyError: if the referenced key is not found
+        :return: resolved value
+        :rtype: Any
+        """
+
+        if site in resolved:
+            return resolved[site]
+
+        target = references[site]
+        if site in visiting or site[: len(target)] == target:
+            if site in visiting:
+                cycle = visiting[visiting.index(site) :] + [site]
+            else:
+                cycle = [site, target]
+            cycle = " -> ".join(".".join(x) for x in cycle)
+            raise ValueError(f"Cyclic reference: {cycle}")
+
+        visiting.append(site)
+        for other in references:
+            if other == site or other in resolved:
+                continue
+            inside = other[: len(target)] == target
+            along = target[: len(other)] == other
+            if inside or along:
+                self._resolve_reference(other, references, resolved, visiting)
+        visiting.pop()
+
+        if not pydash.has(self, list(target)):
+            raise KeyError(f"Referenced key '{'.'.join(target)}' not found")
+        value = pydash.get(self, list(target))
+        pydash.set_(self, list(site), copy.deepcopy(value))
+        resolved[site] = value
+        return value
+
+    def _importer_filename(self, importer: Importer) -> Path:
+        """Resolves the file of an importer directive, relative paths are relative to
+        the current XConfig file
+
+        :param importer: importer directive
+        :type importer: Importer
+        :raises OSError: replace file not found
+        :return: resolved filename
+        :rtype: Path
+        """
+
+        p = Path(importer.path)
+        if self._filename is not None and not p.is_absolute():
+            p = self._filename.parent / p
+
+        if not p.exists():
+            raise OSError(f"File {p} not found!")
+        return p
 
     def _import_external_file(
         self, importer: Importer, chunk_name: Union[str, list], filename: Path
@@ -359,21 +865,36 @@ class XConfig(Box):
         :raises RuntimeError: if external file content is not readable
         """
 
+        pydash.set_(self, chunk_name, self._load_external_file(importer, filename))
+
+    @classmethod
+    def _load_external_file(cls, importer: Importer, filename: Path) -> Any:
+        """Loads the content of a generic file as it has to be imported into cfg tree
+
+        :param importer: importer directive
+        :type importer: Importer
+        :param filename: external filename to import
+        :type filename: Path
+        :raises NotImplementedError: if importer type is not managed yet
+        :raises RuntimeError: if external file content is not readable
+        :return: imported content
+        :rtype: Any
+        """
+
         extension = filename.suffix.replace(".", "")
-        if extension in self.KNOWN_EXTENSIONS:
+        if extension in cls.KNOWN_EXTENSIONS:
             sub_cfg = XConfig(filename=filename)
             if importer.type == ImporterType.IMPORT_ROOT:
-                pydash.set_(self, chunk_name, sub_cfg.root_content)
+                return sub_cfg.root_content
             elif importer.type == ImporterType.IMPORT:
-                pydash.set_(self, chunk_name, sub_cfg)
+                return sub_cfg
             else:
                 raise NotImplementedError(
                     f"Importer type {importer.type} not implemented yet!"
                 )
         else:
             try:
-                content = open(filename, "r").read()
-                pydash.set_(self, chunk_name, content)
+                return open(filename, "r").read()
             except UnicodeDecodeError:
                 raise RuntimeError(
                     f"Error reading content of file: {str(filename)}. Is this a binary file?"
@@ -392,9 +913,13 @@ class XConfig(Box):
         for chunk_name, value in chunks:
             if not isinstance(value, str):
                 continue
-            placeholder = Placeholder.from_string(value)
-            if placeholder is not None:
-                if placeholder.is_valid():
+            placeholders = [DirectiveFactory.build_consumer_from_string(value)]
+            if not isinstance(placeholders[0], Placeholder):
+                interpolation = Interpolation.from_string(value)
+                if interpolation is not None:
+                    placeholders = interpolation.placeholders
+            for placeholder in placeholders:
+                if isinstance(placeholder, Placeholder) and placeholder.is_valid():
                     if placeholder.type == PlaceholderType.ENV:
                         if placeholder.name in os.environ:
                             env_to_replace[placeholder.name] = os.environ.get(
@@ -427,7 +952,8 @@ class XConfig(Box):
         self,
         ignore_defaults: bool = False,
     ) -> Dict[str, Placeholder]:
-        """Retrieves the available placeholders list
+        """Retrieves the available placeholders list. Inline placeholders of a string
+        are keyed with their index (e.g. 'a.b[0]', 'a.b[1]')
 
         :param ignore_defaults: TRUE to ignore placeholders with default
         :type: ignore_defaults: bool
@@ -445,8 +971,48 @@ class XConfig(Box):
                 if ignore_defaults and placelholder.default_value is not None:
                     continue
                 placeholders[key] = placelholder
+                continue
+            interpolation = Interpolation.from_string(v)
+            if interpolation is not None:
+                key = ".".join(k)
+                for index, placelholder in enumerate(interpolation.placeholders):
+                    if ignore_defaults and placelholder.default_value is not None:
+                        continue
+                    placeholders[f"{key}[{index}]"] = placelholder
         return placeholders
 
+    def set_placeholders(self, values: Dict[str, Any]):
+        """Replaces placeholders by key with values cast to their type. Keys are the ones
+        of `available_placeholders`: inline placeholder keys (e.g. 'a.b[0]') replace only
+        that placeholder inside the interpolated string
+
+        :param values: dict of placeholder key -> value, unknown keys are ignored
+        :type values: Dict[str, Any]
+        """
+
+        placeholders = self.available_placeholders()
+        inline = {}
+        for key, value in values.items():
+            if key not in placeholders:
+                continue
+            match = self.INLINE_KEY.match(key)
+            if match is not None and (
+                Interpolation.from_string(pydash.get(self, match.group(1), None))
+                is not None
+            ):
+                # Placeholders of the same string are replaced at once, indices refer
+                # to the original string
+                index = int(match.group(2))
+                inline.setdefault(match.group(1), {})[index] = placeholders[key].cast(
+                    value
+                )
+            else:
+                self.deep_set(key, placeholders[key].cast(value))
+
+        for key, replaced in inline.items():
+            interpolation = Interpolation.from_string(pydash.get(self, key))
+            self.deep_set(key, interpolation.join(replaced))
+
     def check_available_placeholders(
         self,
         close_app: bool = False,
@@ -565,3 +1131,118 @@ class XConfig(Box):
             chunks.append((keys, d))
         if root:
             return chunks
+
+
+class _SweepImport(AbstractSequence):
+    """Sweep variants of an imported XConfig, each one is built on demand as a plain
+    decoded dict
+
+    :param cfg: imported configuration
+    :type cfg: XConfig
+    """
+
+    def __init__(self, cfg: XConfig):
+        self._cfg = cfg
+        self._axes = cfg.sweep_axes()
+        self._length = XConfig._sweep_total(self._axes)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(self._length)[index]]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError(f"Sweep index {index} out of range")
+        digits = XConfig._sweep_unravel(index, self._axes)
+        return XConfig.decode(self._cfg._sweep_variant(self._axes, digits).to_dict())
+
+
+@functools.lru_cache(maxsize=64)
+def _load_sweep_import(filename: str, mtime: int, directive: str) -> Sequence[Any]:
+    """Loads a file imported by a SWEEP option. Results are cached in a bounded LRU
+    keyed also by modification time, so edited files are loaded again
+
+    :param filename: resolved filename
+    :type filename: str
+    :param mtime: file modification time in ns, part of the cache key
+    :type mtime: int
+    :param directive: importer directive string (e.g. '@import(resnet.yml)')
+    :type directive: str
+    :return: the imported options: the lazy sweep variants of a configuration file, a
+    single item otherwise
+    :rtype: Sequence[Any]
+    """
+    importer = Importer.from_string(directive)
+    content = XConfig._load_external_file(importer, Path(filename))
+    if isinstance(content, XConfig):
+        return _SweepImport(content)
+    return (content,)
+
+
+class SweepSet(AbstractSequence):
+    """Delta-encoded collection of sweep results: a base XConfig stored once plus a
+    small map of overridden values (dotted key -> value) for each variant
+
+    :param base: base configuration
+    :type base: XConfig
+    :param overrides: list of per-variant overrides
+    :type overrides: Sequence[Dict[str, Any]]
+    """
+
+    def __init__(self, base: XConfig, overrides: Sequence[Dict[str, Any]]):
+        self._base = base
+        self._overrides = list(overrides)
+
+    @property
+    def base(self) -> XConfig:
+        return self._base
+
+    def overrides(self, index: int) -> Dict[str, Any]:
+        """Overridden values of the i-th variant
+
+        :param index: variant index
+        :type index: int
+        :return: copy of the dict of dotted key -> value
+        :rtype: Dict[str, Any]
+        """
+        return copy.deepcopy(self._overrides[index])
+
+    def __len__(self) -> int:
+        return len(self._overrides)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[XConfig, List[XConfig]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(len(self))[index]]
+        cfg = self._base.copy()
+        for key, value in self._overrides[index].items():
+            cfg.deep_set(key, copy.deepcopy(value))
+        return cfg
+
+    def save_to(self, filename: str):
+        """Saves the set to a single JSONL file: the first line is the base configuration,
+        each following line contains the overrides of a variant
+
+        :param filename: output filename
+        :type filename: str
+        """
+        with open(filename, "w") as f:
+            f.write(json.dumps(XConfig.encode(self._base.to_dict())) + "\n")
+            for overrides in self._overrides:
+                f.write(json.dumps(XConfig.encode(overrides)) + "\n")
+
+    @classmethod
+    def from_file(cls, filename: str) -> "SweepSet":
+        """Loads a set saved with `save_to`
+
+        :param filename: input filename
+        :type filename: str
+        :return: loaded SweepSet
+        :rtype: SweepSet
+        """
+        with open(filename, "r") as f:
+            base = XConfig.from_dict(json.loads(f.readline()), no_deep_parse=True)
+            overrides = [json.loads(line) for line in f if len(line.strip()) > 0]
+        return cls(base, overrides)
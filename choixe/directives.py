@@ -1,5 +1,7 @@
+import functools
 import re
 from abc import ABC
+from typing import Optional, Sequence, Type
 
 
 class Directive(ABC):
@@ -20,6 +22,10 @@ class Directive(ABC):
     def tokenize(cls, value: str) -> dict:
         raise NotImplementedError()
 
+    @property
+    def value(self):
+        return self._value
+
     @property
     def valid(self):
         return self._valid
@@ -41,6 +47,7 @@ class Directive(ABC):
         return self._default_value
 
     def __init__(self, value: str):
+        self._value = value
         if self.is_directive(value):
             self._valid = True
             self._tokens = self.tokenize(value)
@@ -70,6 +77,50 @@ class DirectiveAT(Directive):
     def directive_pattern(cls) -> str:
         return "[@].+[(](.+?)|[)]$"
 
+    @classmethod
+    def is_directive(cls, value: str) -> bool:
+        value = str(value).strip()
+        if not super().is_directive(value):
+            return False
+        # The directive must span the whole value, '@str(a)/b' is an interpolation
+        start = value.find("(")
+        return start >= 0 and cls.closing_parenthesis(value, start + 1) == len(value)
+
+    @classmethod
+    def closing_parenthesis(cls, value: str, start: int) -> Optional[int]:
+        """Finds the end of a parenthesized group, skipping nested groups and quotes.
+        Quotes are only opened at the start of an argument or literal item (after '(',
+        ',', '=', '[', '{' or ':'), so apostrophes inside unquoted values
+        (e.g. 'default=don't') are plain characters
+
+        :param value: source string
+        :type value: str
+        :param start: index following the opening parenthesis
+        :type start: int
+        :return: index following the matching closing parenthesis, None if unbalanced
+        :rtype: Optional[int]
+        """
+
+        depth, quote, previous = 1, None, "("
+        for index in range(start, len(value)):
+            ch = value[index]
+            if quote is not None:
+                if ch == quote:
+                    quote, previous = None, ch
+                continue
+            if ch.isspace():
+                continue
+            if ch in "\"'" and previous in "(,=[{:":
+                quote = ch
+            elif ch == "(":
+                depth += 1
+            elif ch == ")":
+                depth -= 1
+                if depth == 0:
+                    return index + 1
+            previous = ch
+        return None
+
     @classmethod
     def tokenize(cls, value: str) -> dict:
         value = value.strip()
@@ -111,14 +162,78 @@ class DirectiveFactory(object):
 
     AVAILABLE_DIRECTIVES = [DirectiveAT]
 
+    # Directive label -> DirectiveConsumer class (Placeholder, Importer, Sweeper, ...)
+    CONSUMERS_MAP = {}
+
+    @classmethod
+    def register_directive(cls, directive_type: Type[Directive]):
+        """Registers a new directive syntax, tried after the already available ones
+
+        :param directive_type: directive class
+        :type directive_type: Type[Directive]
+        """
+        if directive_type not in cls.AVAILABLE_DIRECTIVES:
+            cls.AVAILABLE_DIRECTIVES.append(directive_type)
+            cls._build_directive.cache_clear()
+
+    @classmethod
+    def register_consumer(
+        cls,
+        labels: Sequence[str],
+        consumer_type: Type["DirectiveConsumer"],
+        override: bool = True,
+    ):
+        """Registers the consumer class of a set of directive labels
+
+        :param labels: directive labels (e.g. ['int', 'float'])
+        :type labels: Sequence[str]
+        :param consumer_type: consumer class built for those labels
+        :type consumer_type: Type[DirectiveConsumer]
+        :param override: FALSE to keep labels already registered by other consumers
+        :type override: bool
+        """
+        for label in labels:
+            if override or label.lower() not in cls.CONSUMERS_MAP:
+                cls.CONSUMERS_MAP[label.lower()] = consumer_type
+
     @classmethod
     def build_directive_from_string(cls, value: str) -> Directive:
-        for dtype in cls.AVAILABLE_DIRECTIVES:
+        """Parses a directive string, each distinct string is parsed only once.
+        Returned directives are shared, they must not be modified
+
+        :param value: directive string
+        :type value: str
+        :return: parsed directive or None if value is not a directive
+        :rtype: Directive
+        """
+        if isinstance(value, str):
+            return cls._build_directive(value)
+        return cls._build_directive.__wrapped__(value)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=65536)
+    def _build_directive(value: str) -> Directive:
+        for dtype in DirectiveFactory.AVAILABLE_DIRECTIVES:
             directive = dtype(value)
             if directive.valid:
                 return directive
         return None
 
+    @classmethod
+    def build_consumer_from_string(cls, value: str) -> Optional["DirectiveConsumer"]:
+        """Parses a directive string and builds the consumer registered for its label
+
+        :param value: directive string
+        :type value: str
+        :return: typed consumer (e.g. Placeholder, Importer, Sweeper) or None if value
+        is not a directive or its label is not registered
+        :rtype: Optional[DirectiveConsumer]
+        """
+        directive = cls.build_directive_from_string(value)
+        if directive is not None and directive.label in cls.CONSUMERS_MAP:
+            return cls.CONSUMERS_MAP[directive.label](directive=directive)
+        return None
+
 
 class DirectiveConsumer(object):
     def __init__(self, directive: Directive) -> None:
@@ -0,0 +1,48 @@
+from pathlib import Path
+from typing import Iterator, Union
+from choixe.configurations import XConfig
+
+
+class FingerprintIndex(object):
+    def __init__(self, filename: str):
+        """On-disk index of configuration fingerprints (e.g. of already executed sweep
+        variants), stored as a text file with a fingerprint per line. Each new entry is
+        appended and flushed immediately, so the index survives an abrupt interruption
+
+        :param filename: index filename, created if it does not exist
+        :type filename: str
+        """
+        self._filename = Path(filename)
+        self._fingerprints = set()
+        if self._filename.exists():
+            with open(self._filename, "r") as f:
+                self._fingerprints = set(x.strip() for x in f if len(x.strip()) > 0)
+
+    @property
+    def filename(self) -> Path:
+        return self._filename
+
+    def add(self, item: Union[str, XConfig]):
+        """Adds a fingerprint to the index
+
+        :param item: fingerprint or XConfig to fingerprint
+        :type item: Union[str, XConfig]
+        """
+        fingerprint = item.fingerprint() if isinstance(item, XConfig) else str(item)
+        if fingerprint in self._fingerprints:
+            return
+        self._filename.parent.mkdir(parents=True, exist_ok=True)
+        with open(self._filename, "a") as f:
+            f.write(fingerprint + "\n")
+        self._fingerprints.add(fingerprint)
+
+    def __contains__(self, item: Union[str, XConfig]) -> bool:
+        if isinstance(item, XConfig):
+            item = item.fingerprint()
+        return item in self._fingerprints
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._fingerprints)
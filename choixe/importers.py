@@ -67,3 +67,6 @@ class Importer(DirectiveConsumer):
         return DirectiveAT.generate_directive_string(
             str(importer_type.name).lower(), [path]
         )
+
+
+DirectiveFactory.register_consumer(ImporterType.values(), Importer)
@@ -7,10 +7,11 @@ from choixe.placeholders import Placeholder, PlaceholderType
 class XInquirer(object):
     @classmethod
     def to_bool(cls, value: Union[str, None]):
-        true_values = ["t", "true", "y", "yes"]
-        if value is not None and value.lower() in true_values:
-            return True
-        else:
+        if value is None:
+            return False
+        try:
+            return PlaceholderType.cast(value, PlaceholderType.BOOL)
+        except ValueError:
             return False
 
     @classmethod
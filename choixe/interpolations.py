@@ -0,0 +1,131 @@
+import functools
+import re
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+from choixe.directives import DirectiveAT, DirectiveFactory
+from choixe.placeholders import Placeholder
+
+
+class Interpolation(object):
+    # Start of an inline directive, its end is found matching the parentheses
+    DIRECTIVE_START = re.compile(r"@(\w+)\(")
+
+    def __init__(self, value: str, spans: Sequence[Tuple[int, int]]):
+        """String with inline placeholders (e.g. '/data/@str(dataset)/train'). Fragment
+        offsets are recorded once, rendering only concatenates the literal fragments
+        with the placeholder values
+
+        :param value: source string
+        :type value: str
+        :param spans: (start, end) offsets of the inline placeholders, in order
+        :type spans: Sequence[Tuple[int, int]]
+        """
+
+        self._value = value
+        self._literals = []
+        self._texts = []
+        self._placeholders = []
+        last = 0
+        for start, end in spans:
+            self._literals.append(value[last:start])
+            self._texts.append(value[start:end])
+            self._placeholders.append(Placeholder.from_string(value[start:end]))
+            last = end
+        self._literals.append(value[last:])
+
+    @property
+    def value(self) -> str:
+        return self._value
+
+    @property
+    def placeholders(self) -> List[Placeholder]:
+        return list(self._placeholders)
+
+    @property
+    def names(self) -> Set[str]:
+        return {p.name for p in self._placeholders}
+
+    def render(self, m: Dict[str, Any]) -> str:
+        """Replaces the inline placeholders found in a map with their values cast to
+        the placeholder type, the others are left untouched
+
+        :param m: dict of key/value = placeholder name/new value
+        :type m: Dict[str, Any]
+        :return: rendered string
+        :rtype: str
+        """
+
+        return self.join(
+            {
+                index: p.cast(m[p.name])
+                for index, p in enumerate(self._placeholders)
+                if p.name in m
+            }
+        )
+
+    def join(self, values: Dict[int, Any]) -> str:
+        """Concatenates the literal fragments with already cast values
+
+        :param values: map of placeholder index -> value, missing placeholders are
+        left untouched
+        :type values: Dict[int, Any]
+        :return: rendered string
+        :rtype: str
+        """
+
+        out = [self._literals[0]]
+        for index, text in enumerate(self._texts):
+            out.append(str(values[index]) if index in values else text)
+            out.append(self._literals[index + 1])
+        return "".join(out)
+
+    @classmethod
+    def scan(cls, value: str) -> List[Tuple[int, int]]:
+        """Finds the inline placeholders of a string
+
+        :param value: source string
+        :type value: str
+        :return: (start, end) offsets of the inline placeholders, in order
+        :rtype: List[Tuple[int, int]]
+        """
+
+        spans = []
+        match = cls.DIRECTIVE_START.search(value)
+        while match is not None:
+            end = DirectiveAT.closing_parenthesis(value, match.end())
+            if end is None:
+                break
+            consumer = DirectiveFactory.build_consumer_from_string(
+                value[match.start() : end]
+            )
+            # SWEEP labels are consumed by sweepers, they are not interpolated
+            if isinstance(consumer, Placeholder) and consumer.is_valid():
+                spans.append((match.start(), end))
+                match = cls.DIRECTIVE_START.search(value, end)
+            else:
+                match = cls.DIRECTIVE_START.search(value, match.start() + 1)
+        return spans
+
+    @classmethod
+    def from_string(cls, value: str) -> Optional["Interpolation"]:
+        """Builds the interpolation of a string, each distinct string is scanned once
+
+        :param value: source string
+        :type value: str
+        :return: interpolation or None if value is not a string with inline
+        placeholders (whole value directives are not interpolations)
+        :rtype: Optional[Interpolation]
+        """
+
+        if not isinstance(value, str) or "@" not in value:
+            return None
+        return cls._from_string(value)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=65536)
+    def _from_string(value: str) -> Optional["Interpolation"]:
+        if DirectiveAT.is_directive(value):
+            return None
+        spans = Interpolation.scan(value)
+        if len(spans) == 0:
+            return None
+        return Interpolation(value, spans)
@@ -1,5 +1,10 @@
+import ast
+import datetime
+import numbers
 from enum import Enum, auto
-from typing import Optional, Union
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence, Union
+import numpy as np
 from choixe.directives import Directive, DirectiveConsumer, DirectiveFactory
 from choixe.importers import Importer, ImporterType
 
@@ -16,6 +21,13 @@ class PlaceholderType(Enum):
     CFG = auto()
     CFG_ROOT = auto()
     SWEEP = auto()
+    SWEEP_RANGE = auto()
+    SWEEP_LINSPACE = auto()
+    SWEEP_LOGSPACE = auto()
+    LIST_INT = auto()
+    LIST_FLOAT = auto()
+    LIST_STR = auto()
+    LIST_BOOL = auto()
 
     @classmethod
     def values(cls):
@@ -38,28 +50,130 @@ class PlaceholderType(Enum):
 
     @classmethod
     def cast(cls, value: any, tp: "PlaceholderType"):
-        if tp == PlaceholderType.BOOL:
-            return bool(value)
-        elif tp == PlaceholderType.STR:
-            return str(value)
-        elif tp == PlaceholderType.INT:
-            return int(value)
-        elif tp == PlaceholderType.FLOAT:
-            return float(value)
-        elif tp == PlaceholderType.PATH:
-            return value
-        elif tp == PlaceholderType.DATE:
-            return value
-        elif tp == PlaceholderType.ENV:
-            return str(value)
-        elif tp == PlaceholderType.OBJECT:
-            return value
-        elif tp == PlaceholderType.CFG:
-            return Importer.generate_importer_directive(ImporterType.IMPORT, value)
-        elif tp == PlaceholderType.CFG_ROOT:
-            return Importer.generate_importer_directive(ImporterType.IMPORT_ROOT, value)
-        else:
+        if tp not in _CASTS:
             raise NotImplementedError(f"No cast for type [{tp}] on [{value}]")
+        return _CASTS[tp](value)
+
+    @classmethod
+    def cast_many(cls, values: Sequence[any], tp: "PlaceholderType") -> List[any]:
+        """Casts many values of the same type at once, numeric types are converted
+        with numpy in a single pass
+
+        :param values: values to cast
+        :type values: Sequence[any]
+        :param tp: target type
+        :type tp: PlaceholderType
+        :return: list of cast values
+        :rtype: List[any]
+        """
+
+        if tp in _NUMPY_DTYPES:
+            try:
+                return _numpy_cast(values, _NUMPY_DTYPES[tp])
+            except (ValueError, TypeError, OverflowError):
+                # Slow path, raises the same errors of `cast`
+                pass
+        elif tp in _LIST_ITEM_DTYPES:
+            lists = [_parse_list(v) for v in values]
+            try:
+                # Arrays of equal length lists are cast as a single matrix
+                return _numpy_cast(lists, _LIST_ITEM_DTYPES[tp])
+            except (ValueError, TypeError, OverflowError):
+                pass
+        return [cls.cast(v, tp) for v in values]
+
+
+_TRUE_STRINGS = ("true", "t", "yes", "y", "on", "1")
+_FALSE_STRINGS = ("false", "f", "no", "n", "off", "0", "")
+
+
+def _cast_bool(value: any) -> bool:
+    """Casts to bool, strings must be true/false-like (the same accepted by XInquirer)"""
+    if isinstance(value, str):
+        v = value.strip().lower()
+        if v in _TRUE_STRINGS:
+            return True
+        if v in _FALSE_STRINGS:
+            return False
+        raise ValueError(f"Invalid bool value: {value}")
+    return bool(value)
+
+
+def _cast_date(value: any) -> datetime.datetime:
+    """Casts to a naive datetime. Timestamps and timezone-aware values are converted
+    to UTC, so that all the results are comparable"""
+    if isinstance(value, datetime.datetime):
+        date = value
+    elif isinstance(value, datetime.date):
+        date = datetime.datetime(value.year, value.month, value.day)
+    elif isinstance(value, numbers.Number):
+        # POSIX timestamp
+        date = datetime.datetime.fromtimestamp(value, tz=datetime.timezone.utc)
+    else:
+        date = datetime.datetime.fromisoformat(str(value).strip())
+
+    if date.tzinfo is not None:
+        date = date.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return date
+
+
+def _parse_list(value: any) -> list:
+    """Parses a list from a string ('1,2,3' or '[1, 2, 3]'), an array or an iterable"""
+    if isinstance(value, str):
+        value = value.strip()
+        if value.startswith("[") or value.startswith("("):
+            return list(ast.literal_eval(value))
+        return [x.strip() for x in value.split(",") if len(x.strip()) > 0]
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return list(value)
+
+
+def _list_cast(item_cast: Callable[[any], any]) -> Callable[[any], list]:
+    def _cast(value: any) -> list:
+        return [item_cast(x) for x in _parse_list(value)]
+
+    return _cast
+
+
+def _numpy_cast(values: Sequence[any], dtype: type) -> list:
+    array = np.asarray(values)
+    # Like int()/float(), numpy accepts bools, numbers and numeric strings only
+    if array.dtype.kind not in "biufU":
+        raise TypeError(f"Values of kind {array.dtype.kind} are cast one by one")
+    return array.astype(dtype).tolist()
+
+
+_CASTS = {
+    PlaceholderType.BOOL: _cast_bool,
+    PlaceholderType.STR: str,
+    PlaceholderType.INT: int,
+    PlaceholderType.FLOAT: float,
+    PlaceholderType.PATH: lambda x: Path(str(x)),
+    PlaceholderType.DATE: _cast_date,
+    PlaceholderType.ENV: str,
+    PlaceholderType.OBJECT: lambda x: x,
+    PlaceholderType.CFG: lambda x: Importer.generate_importer_directive(
+        ImporterType.IMPORT, x
+    ),
+    PlaceholderType.CFG_ROOT: lambda x: Importer.generate_importer_directive(
+        ImporterType.IMPORT_ROOT, x
+    ),
+    PlaceholderType.LIST_INT: _list_cast(int),
+    PlaceholderType.LIST_FLOAT: _list_cast(float),
+    PlaceholderType.LIST_STR: _list_cast(str),
+    PlaceholderType.LIST_BOOL: _list_cast(_cast_bool),
+}
+
+_NUMPY_DTYPES = {
+    PlaceholderType.INT: np.int64,
+    PlaceholderType.FLOAT: np.float64,
+}
+
+_LIST_ITEM_DTYPES = {
+    PlaceholderType.LIST_INT: np.int64,
+    PlaceholderType.LIST_FLOAT: np.float64,
+}
 
 
 class Placeholder(DirectiveConsumer):
@@ -111,3 +225,9 @@ class Placeholder(DirectiveConsumer):
         if directive:
             return Placeholder(directive=directive)
         return None
+
+
+# SWEEP labels are also placeholders, but Sweeper is their typed consumer
+DirectiveFactory.register_consumer(
+    PlaceholderType.values(), Placeholder, override=False
+)
@@ -0,0 +1,66 @@
+from enum import Enum, auto
+from typing import List, Union
+from choixe.directives import (
+    Directive,
+    DirectiveAT,
+    DirectiveConsumer,
+    DirectiveFactory,
+)
+
+
+class ReferenceType(Enum):
+    REF = auto()
+
+    @classmethod
+    def values(cls):
+        return list([c.name.lower() for c in cls])
+
+    @classmethod
+    def get_type(cls, value: str) -> Union["ReferenceType", None]:
+        return ReferenceType[value.upper()]
+
+
+class Reference(DirectiveConsumer):
+    def __init__(self, directive: Directive):
+        super().__init__(directive=directive)
+
+    def is_valid(self):
+        if self._directive.valid:
+            return (
+                self._directive.label in ReferenceType.values()
+                and len(self._directive.args) > 0
+            )
+        return False
+
+    @property
+    def path(self) -> str:
+        if self.is_valid():
+            return str(self._directive.args[0]).strip()
+        return ""
+
+    @property
+    def keys(self) -> List[str]:
+        """Referenced key as a list of str pydash key (e.g. 'a.b.0' -> ['a', 'b', '0'])"""
+        return self.path.split(".") if self.path else []
+
+    @property
+    def type(self):
+        if self.is_valid():
+            return ReferenceType.get_type(self._directive.label)
+        return None
+
+    @classmethod
+    def from_string(cls, value: str) -> "Reference":
+        directive = DirectiveFactory.build_directive_from_string(value)
+        if directive:
+            return Reference(directive=directive)
+        return None
+
+    @classmethod
+    def generate_reference_directive(cls, path: str):
+        return DirectiveAT.generate_directive_string(
+            str(ReferenceType.REF.name).lower(), [path]
+        )
+
+
+DirectiveFactory.register_consumer(ReferenceType.values(), Reference)
@@ -1,21 +1,174 @@
 from __future__ import annotations
 from abc import ABCMeta
 
+import collections
+import contextlib
+import copy
+import dataclasses
+import importlib
+import inspect
+import json
+import numbers
+import operator
+import os
+import pkgutil
+import struct
+import threading
+import time
 import typing
+from pathlib import Path
 from schema import Schema
 from choixe.configurations import XConfig
+from choixe.placeholders import PlaceholderType
+
+
+def _msgpack():
+    try:
+        import msgpack
+    except ImportError:
+        raise RuntimeError(
+            "msgpack format requires the 'msgpack' package, install 'choixe[msgpack]'"
+        )
+    return msgpack
+
+
+class SpookInstancesCache(object):
+    """Bounded LRU of the instances of `cacheable` Spooks, keyed by spook name and
+    canonical (sorted keys JSON) args. Thread safe
+
+    :param maxsize: maximum number of cached instances, defaults to 4096
+    :type maxsize: int, optional
+    """
+
+    CacheInfo = collections.namedtuple(
+        "CacheInfo", ["hits", "misses", "maxsize", "currsize"]
+    )
+
+    def __init__(self, maxsize: int = 4096):
+        self._maxsize = maxsize
+        self._entries = collections.OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def key(self, d: dict) -> typing.Optional[tuple]:
+        """Builds the cache key of a serialized Spook
+
+        :param d: serialized dict
+        :type d: dict
+        :return: cache key, None if args are not JSON serializable
+        :rtype: Optional[tuple]
+        """
+        try:
+            args = json.dumps(
+                d[Spook.ARGS_FIELD], sort_keys=True, separators=(",", ":")
+            )
+        except (TypeError, ValueError):
+            return None
+        return d[Spook.TYPE_FIELD], args
+
+    def get(self, key: tuple) -> typing.Optional[list]:
+        """Retrieves a cached entry, counting hits and misses
+
+        :param key: cache key
+        :type key: tuple
+        :return: [instance, TRUE if validated] or None if missing
+        :rtype: Optional[list]
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry
+
+    def put(self, key: tuple, obj: any, validated: bool):
+        """Stores an instance, evicting the least recently used ones if full
+
+        :param key: cache key
+        :type key: tuple
+        :param obj: hydrated instance
+        :type obj: any
+        :param validated: TRUE if the source dict was validated
+        :type validated: bool
+        """
+        with self._lock:
+            self._entries[key] = [obj, validated]
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def info(self) -> SpookInstancesCache.CacheInfo:
+        """Cache statistics
+
+        :return: hits, misses, maxsize and current size
+        :rtype: SpookInstancesCache.CacheInfo
+        """
+        with self._lock:
+            return self.CacheInfo(
+                self._hits, self._misses, self._maxsize, len(self._entries)
+            )
+
+    def resize(self, maxsize: int):
+        """Changes the maximum size, evicting exceeding entries
+
+        :param maxsize: new maximum number of cached instances
+        :type maxsize: int
+        """
+        with self._lock:
+            self._maxsize = maxsize
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Removes all the cached instances and resets statistics"""
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+def _entry_points(group: str) -> list:
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:  # pragma: no cover, python < 3.8
+        return []
+    eps = entry_points()
+    if hasattr(eps, "select"):
+        return list(eps.select(group=group))
+    return list(eps.get(group, []))
 
 
 class MetaSpook(ABCMeta):
     # 😱😱😱😱😱😱😱😱😱😱😱😱😱😱
     SPOOKS_MAP = {}
 
+    # Spook class -> (spook_schema function, full schema, TRUE if args are validated)
+    SCHEMAS_MAP = {}
+
+    # Guards the updates of the factory maps
+    LOCK = threading.RLock()
+
+    # Spook name -> module defining it, from entry points and index files. Modules are
+    # imported only when one of their Spooks is needed
+    SPOOKS_INDEX = {}
+    ENTRY_POINTS_GROUP = "choixe.spooks"
+    # Index files to load, separated by os.pathsep
+    INDEX_ENV_VARIABLE = "CHOIXE_SPOOKS_INDEX"
+    _INDEX_LOADED = False
+
     def __init__(self, name, bases, dict) -> None:
+        # Schemas are compiled at the first use, `spook_schema` may reference classes
+        # defined later in the module
         MetaSpook.register_spook(self)
 
     @classmethod
     def clear_factory(cls):
-        cls.SPOOKS_MAP = {}
+        with cls.LOCK:
+            cls.SPOOKS_MAP = {}
+            cls.SCHEMAS_MAP = {}
 
     @classmethod
     def register_spook(cls, x: typing.Type[Spook]):
@@ -24,15 +177,144 @@ class MetaSpook(ABCMeta):
         :param x: target class to register. It must be a Spook!
         :type x: Type[Spook]
         """
-        cls.SPOOKS_MAP[x.spook_name()] = x
+        with cls.LOCK:
+            cls.SPOOKS_MAP[x.spook_name()] = x
+
+    @classmethod
+    def load_index(cls, filename: str):
+        """Loads an index file (JSON map of spook name -> module, see `build_index`)
+
+        :param filename: index filename
+        :type filename: str
+        """
+        with open(filename, "r") as f:
+            index = json.load(f)
+        with cls.LOCK:
+            cls.SPOOKS_INDEX.update(index)
+
+    @classmethod
+    def build_index(
+        cls, modules: typing.Sequence[str], recursive: bool = True
+    ) -> typing.Dict[str, str]:
+        """Imports some modules and indexes the Spooks they define
+
+        :param modules: names of the modules (or packages) to index
+        :type modules: Sequence[str]
+        :param recursive: TRUE to index also the submodules of packages, defaults to True
+        :type recursive: bool, optional
+        :return: map of spook name -> module
+        :rtype: Dict[str, str]
+        """
+        names = set()
+        for module_name in modules:
+            module = importlib.import_module(module_name)
+            names.add(module.__name__)
+            if recursive and hasattr(module, "__path__"):
+                prefix = f"{module.__name__}."
+                for info in pkgutil.walk_packages(module.__path__, prefix):
+                    importlib.import_module(info.name)
+                    names.add(info.name)
+
+        return {
+            name: x.__module__
+            for name, x in sorted(cls.SPOOKS_MAP.items())
+            if isinstance(x, type) and x.__module__ in names
+        }
+
+    @classmethod
+    def indexed_module(cls, name: str) -> typing.Union[None, str]:
+        """Retrieves the module defining a Spook from the index. Entry points and the
+        index files listed in the `CHOIXE_SPOOKS_INDEX` environment variable are loaded
+        at the first lookup
+
+        :param name: spook name
+        :type name: str
+        :return: module name, None if the Spook is not indexed
+        :rtype: Union[None, str]
+        """
+        if not cls._INDEX_LOADED:
+            with cls.LOCK:
+                if not cls._INDEX_LOADED:
+                    cls._load_default_index()
+                    cls._INDEX_LOADED = True
+        return cls.SPOOKS_INDEX.get(name, None)
+
+    @classmethod
+    def _load_default_index(cls):
+        for entry_point in _entry_points(cls.ENTRY_POINTS_GROUP):
+            # Entry points map a spook name to 'module' or 'module:ClassName'
+            cls.SPOOKS_INDEX.setdefault(
+                entry_point.name, entry_point.value.split(":")[0].strip()
+            )
+        for filename in os.environ.get(cls.INDEX_ENV_VARIABLE, "").split(os.pathsep):
+            if len(filename) > 0:
+                cls.load_index(filename)
+
+    @classmethod
+    def register_schema(cls, x: typing.Type[Spook]) -> Schema:
+        """Compiles the full schema of a Spook and caches it
+
+        :param x: target class. It must be a Spook!
+        :type x: Type[Spook]
+        :return: compiled full schema
+        :rtype: Schema
+        """
+        args_schema = x.spook_schema()
+        schema = Schema({x.TYPE_FIELD: x.spook_name(), x.ARGS_FIELD: args_schema})
+        with cls.LOCK:
+            cls.SCHEMAS_MAP[x] = (
+                cls._schema_function(x),
+                schema,
+                args_schema is not None,
+            )
+        return schema
+
+    @classmethod
+    def cached_schema(cls, x: typing.Type[Spook]) -> typing.Tuple[Schema, bool]:
+        """Retrieves the cached full schema of a Spook, compiling it at the first call
+        or again if the class `spook_schema` has been replaced since the last one
+
+        :param x: target class. It must be a Spook!
+        :type x: Type[Spook]
+        :return: full schema and TRUE if the Spook args have a schema to validate
+        :rtype: Tuple[Schema, bool]
+        """
+        cached = cls.SCHEMAS_MAP.get(x)
+        if cached is None or cached[0] is not cls._schema_function(x):
+            cls.register_schema(x)
+            cached = cls.SCHEMAS_MAP[x]
+        return cached[1], cached[2]
+
+    @classmethod
+    def _schema_function(cls, x: typing.Type[Spook]) -> typing.Callable:
+        return getattr(x.spook_schema, "__func__", x.spook_schema)
 
 
 class Spook(metaclass=MetaSpook):
     # 👻👻👻👻👻👻👻👻👻👻👻👻👻👻
 
+    # Lets subclasses be slotted, see `fast_spook`
+    __slots__ = ()
+
     TYPE_FIELD = "__spook__"
     ARGS_FIELD = "args"
 
+    # Process-level trusted mode: inputs are already validated, skip schema validation
+    TRUSTED = False
+
+    # Seconds a failed dynamic import is remembered before being retried
+    IMPORT_FAILURE_TTL = 30.0
+
+    # TRUE for immutable Spooks: identical serializations are hydrated into a shared
+    # instance, kept in INSTANCES_CACHE
+    cacheable = False
+    INSTANCES_CACHE = SpookInstancesCache()
+
+    # Full name -> imported object
+    _IMPORTS_CACHE = {}
+    # Full name -> (time of the failure, error message)
+    _IMPORT_FAILURES = {}
+
     @classmethod
     def spook_name(cls) -> str:
         # return cls.__name__
@@ -40,9 +322,7 @@ class Spook(metaclass=MetaSpook):
 
     @classmethod
     def full_spook_schema(cls) -> Schema:
-        return Schema(
-            {Spook.TYPE_FIELD: cls.spook_name(), Spook.ARGS_FIELD: cls.spook_schema()}
-        )
+        return MetaSpook.cached_schema(cls)[0]
 
     @classmethod
     def spook_schema(cls) -> typing.Union[None, dict]:
@@ -55,21 +335,192 @@ class Spook(metaclass=MetaSpook):
     def to_dict(self) -> dict:
         return self.__dict__
 
+    @classmethod
+    def set_trusted(cls, trusted: bool = True):
+        """Enables the process-level trusted mode, where serialization and hydratation
+        skip the schema validation of inputs already validated upstream
+
+        :param trusted: TRUE to skip validation, defaults to True
+        :type trusted: bool, optional
+        """
+        Spook.TRUSTED = trusted
+
+    @classmethod
+    @contextlib.contextmanager
+    def trusted(cls) -> typing.Iterator[None]:
+        """Context manager enabling the trusted mode, see `set_trusted`"""
+        previous = Spook.TRUSTED
+        Spook.TRUSTED = True
+        try:
+            yield
+        finally:
+            Spook.TRUSTED = previous
+
     @classmethod
     def _validate_schema(cls, d: dict):
-        if cls.spook_schema() is not None:
-            cls.full_spook_schema().validate(d)
+        if Spook.TRUSTED:
+            return
+        schema, validated = MetaSpook.cached_schema(cls)
+        if validated:
+            schema.validate(d)
+
+    def serialize(self, validate: bool = True, recursive: bool = False) -> dict:
+        """Serializes the Spook into a dict
 
-    def serialize(self, validate: bool = True) -> dict:
+        :param validate: TRUE to validate the output schema, defaults to True
+        :type validate: bool, optional
+        :param recursive: TRUE to serialize also the Spooks found in `to_dict` output
+        (in dicts, lists and tuples). The same instance is serialized once and its
+        serialization is shared, defaults to False
+        :type recursive: bool, optional
+        :return: serialized dict
+        :rtype: dict
+        """
+        if recursive:
+            return self._serialize_tree(self, validate, {})
         out = {Spook.TYPE_FIELD: self.spook_name(), Spook.ARGS_FIELD: self.to_dict()}
         if validate:
             self._validate_schema(out)
         return out
 
+    @classmethod
+    def _serialize_tree(cls, value: any, validate: bool, memo: dict) -> any:
+        if isinstance(value, Spook):
+            if id(value) not in memo:
+                args = cls._serialize_tree(value.to_dict(), validate, memo)
+                out = {Spook.TYPE_FIELD: value.spook_name(), Spook.ARGS_FIELD: args}
+                if validate:
+                    value._validate_schema(out)
+                memo[id(value)] = out
+            return memo[id(value)]
+        if isinstance(value, dict):
+            return {k: cls._serialize_tree(v, validate, memo) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [cls._serialize_tree(v, validate, memo) for v in value]
+        return value
+
     def serialize_to_file(self, path: str, validate: bool = True):
-        serialization = self.serialize(validate=validate)
-        cfg = XConfig.from_dict(serialization)
-        cfg.save_to(path)
+        serialization = XConfig.encode(self.serialize(validate=validate))
+        if "json" in Path(path).suffix.lower():
+            with open(path, "w") as f:
+                json.dump(serialization, f)
+        else:
+            # Serialized spooks hold no directive to parse
+            cfg = XConfig.from_dict(serialization, no_deep_parse=True)
+            cfg.save_to(path)
+
+    @classmethod
+    def dump_many(
+        cls,
+        spooks: typing.Iterable[Spook],
+        filename: str,
+        validate: bool = True,
+        recursive: bool = False,
+        fmt: typing.Optional[str] = None,
+    ) -> int:
+        """Streams many Spooks to a file, one record each, with no XConfig round trip
+
+        :param spooks: Spooks to serialize
+        :type spooks: Iterable[Spook]
+        :param filename: output filename
+        :type filename: str
+        :param validate: TRUE to validate serializations schema, defaults to True
+        :type validate: bool, optional
+        :param recursive: TRUE to serialize nested Spooks, see `serialize`,
+        defaults to False
+        :type recursive: bool, optional
+        :param fmt: 'jsonl' or 'msgpack' (length-prefixed records, requires the msgpack
+        package), None to infer it from the extension, defaults to None
+        :type fmt: Optional[str], optional
+        :return: number of written records
+        :rtype: int
+        """
+        fmt = cls._records_format(filename, fmt)
+        count = 0
+        if fmt == "jsonl":
+            with open(filename, "w") as f:
+                for spook in spooks:
+                    out = spook.serialize(validate=validate, recursive=recursive)
+                    f.write(json.dumps(XConfig.encode(out), separators=(",", ":")))
+                    f.write("\n")
+                    count += 1
+        else:
+            packer = _msgpack().Packer()
+            with open(filename, "wb") as f:
+                for spook in spooks:
+                    out = spook.serialize(validate=validate, recursive=recursive)
+                    record = packer.pack(XConfig.encode(out))
+                    f.write(struct.pack(">I", len(record)))
+                    f.write(record)
+                    count += 1
+        return count
+
+    @classmethod
+    def load_many(
+        cls,
+        filename: str,
+        validate: bool = True,
+        recursive: bool = False,
+        lazy: bool = False,
+        fmt: typing.Optional[str] = None,
+    ) -> typing.Iterator[any]:
+        """Streams the Spooks of a file written by `dump_many`
+
+        :param filename: input filename
+        :type filename: str
+        :param validate: TRUE to validate dicts schema before hydratation, defaults to True
+        :type validate: bool, optional
+        :param recursive: TRUE to hydrate nested Spooks, see `create`, defaults to False
+        :type recursive: bool, optional
+        :param lazy: TRUE to defer hydratation until first use, see `create`,
+        defaults to False
+        :type lazy: bool, optional
+        :param fmt: 'jsonl' or 'msgpack', None to infer it from the extension,
+        defaults to None
+        :type fmt: Optional[str], optional
+        :raises RuntimeError: if a msgpack record is truncated
+        :return: iterator over hydrated objects, in file order
+        :rtype: Iterator[any]
+        """
+        fmt = cls._records_format(filename, fmt)
+        if fmt == "jsonl":
+            with open(filename, "r") as f:
+                for line in f:
+                    if len(line.strip()) > 0:
+                        yield cls.create(
+                            json.loads(line),
+                            validate=validate,
+                            recursive=recursive,
+                            lazy=lazy,
+                        )
+        else:
+            msgpack = _msgpack()
+            with open(filename, "rb") as f:
+                while True:
+                    header = f.read(4)
+                    if len(header) == 0:
+                        break
+                    if len(header) < 4:
+                        raise RuntimeError(f"Truncated record in {filename}")
+                    size = struct.unpack(">I", header)[0]
+                    record = f.read(size)
+                    if len(record) < size:
+                        raise RuntimeError(f"Truncated record in {filename}")
+                    yield cls.create(
+                        msgpack.unpackb(record),
+                        validate=validate,
+                        recursive=recursive,
+                        lazy=lazy,
+                    )
+
+    @classmethod
+    def _records_format(cls, filename: str, fmt: typing.Optional[str]) -> str:
+        if fmt is None:
+            suffix = Path(filename).suffix.lower()
+            fmt = "msgpack" if suffix in (".msgpack", ".mpk") else "jsonl"
+        if fmt not in ("jsonl", "msgpack"):
+            raise NotImplementedError(f"Format {fmt} not supported yet!")
+        return fmt
 
     @classmethod
     def hydrate(cls, d: dict, validate: bool = True) -> any:
@@ -88,33 +539,98 @@ class Spook(metaclass=MetaSpook):
 
     @classmethod
     def dynamic_import(cls, full_name: str) -> typing.Any:
-        """Dynamic import of full qualified name (module....ClassName)
+        """Dynamic import of full qualified name (module....ClassName). The longest
+        importable prefix is imported as a module, submodules included, and the rest is
+        resolved as attributes. Resolved names are cached, failures are cached for
+        `IMPORT_FAILURE_TTL` seconds and raised again without retrying the import
 
         :param full_name: full qualified name
         :type full_name: str
+        :raises ImportError: if the name cannot be imported
         :return: imported class/function
         :rtype: typing.Any
         """
+        if full_name in Spook._IMPORTS_CACHE:
+            return Spook._IMPORTS_CACHE[full_name]
+
+        failure = Spook._IMPORT_FAILURES.get(full_name)
+        if failure is not None:
+            if time.monotonic() - failure[0] < Spook.IMPORT_FAILURE_TTL:
+                raise ImportError(failure[1])
+
+        try:
+            obj = cls._import_name(full_name)
+        except ImportError as e:
+            with MetaSpook.LOCK:
+                Spook._IMPORT_FAILURES[full_name] = (time.monotonic(), str(e))
+            raise
+
+        with MetaSpook.LOCK:
+            Spook._IMPORTS_CACHE[full_name] = obj
+            Spook._IMPORT_FAILURES.pop(full_name, None)
+        return obj
+
+    @classmethod
+    def clear_import_cache(cls):
+        """Forgets resolved and failed dynamic imports"""
+        with MetaSpook.LOCK:
+            Spook._IMPORTS_CACHE = {}
+            Spook._IMPORT_FAILURES = {}
+
+    @classmethod
+    def _import_name(cls, full_name: str) -> typing.Any:
         components = full_name.split(".")
-        mod = __import__(components[0])
-        for comp in components[1:]:
-            mod = getattr(mod, comp)
-        return mod
+        for split in range(len(components), 0, -1):
+            module_name = ".".join(components[:split])
+            try:
+                obj = importlib.import_module(module_name)
+            except ModuleNotFoundError as e:
+                # Missing dependencies of an existing module are real errors
+                if e.name is not None and not (
+                    module_name == e.name or module_name.startswith(e.name + ".")
+                ):
+                    raise
+                continue
+            except ValueError:
+                # Empty module names
+                continue
+            for index, comp in enumerate(components[split:], start=split):
+                try:
+                    obj = getattr(obj, comp)
+                except AttributeError:
+                    raise ImportError(
+                        f"{'.'.join(components[:index])} has no attribute '{comp}'"
+                    )
+            return obj
+        raise ImportError(f"No module found for {full_name}")
 
     @classmethod
-    def create_from_file(cls, filename: str) -> any:
+    def create_from_file(
+        cls, filename: str, recursive: bool = False, lazy: bool = False
+    ) -> any:
         """Creates an object starting from its serialized representation in a file loadable
         as XConfig (yml, json, etc.)
 
         :param filename: config filename
         :type filename: str
+        :param recursive: TRUE to hydrate nested Spooks, see `create`, defaults to False
+        :type recursive: bool, optional
+        :param lazy: TRUE to defer hydratation until first use, see `create`,
+        defaults to False
+        :type lazy: bool, optional
         :return: hydrated object
         :rtype: any
         """
-        return cls.create(XConfig(filename))
+        return cls.create(XConfig(filename), recursive=recursive, lazy=lazy)
 
     @classmethod
-    def create(cls, d: dict, validate: bool = True) -> any:
+    def create(
+        cls,
+        d: dict,
+        validate: bool = True,
+        recursive: bool = False,
+        lazy: bool = False,
+    ) -> any:
         """Creates an object starting from its serialized dict.
         It must be a Spook serialized class containing all deserialization attributes
 
@@ -122,21 +638,521 @@ class Spook(metaclass=MetaSpook):
         :type d: dict
         :param validate: TRUE to validate dict schema before hydratation, defaults to False
         :type validate: bool, optional
+        :param recursive: TRUE to hydrate also the serialized Spooks nested in args (in
+        dicts and lists) before their parent, so that `from_dict` receives hydrated
+        objects. Nested specs with identical content (e.g. repeated with '@ref' or YAML
+        anchors) are hydrated once into a shared instance, defaults to False
+        :type recursive: bool, optional
+        :param lazy: TRUE to return a SpookProxy deferring the class import and the
+        hydratation until first use, defaults to False
+        :type lazy: bool, optional
         :raises RuntimeError: when corresponding class is not registered in the factory map
         :return: hydrated object
         :rtype: any
         """
-        if d[Spook.TYPE_FIELD] not in cls.SPOOKS_MAP:
+        if isinstance(d, (SpookProxy, Spook)):
+            return d
+        if lazy:
+            return SpookProxy(d, validate=validate, recursive=recursive)
+        if recursive:
+            return cls._create_tree(d, validate, {})
+        bt = cls._spook_class(d[Spook.TYPE_FIELD])
+        if bt is not None:
+            return _cached_hydrate(bt, d, validate)
+        raise RuntimeError(f"Non serializable data: {d}")
+
+    @classmethod
+    def _create_tree(cls, value: any, validate: bool, memo: dict) -> any:
+        if isinstance(value, dict):
+            if Spook.TYPE_FIELD in value and Spook.ARGS_FIELD in value:
+                keys = [("id", id(value))]
+                try:
+                    content = json.dumps(value, sort_keys=True, separators=(",", ":"))
+                    keys.append(("content", content))
+                except (TypeError, ValueError):
+                    pass
+                for key in keys:
+                    if key in memo:
+                        return memo[key]
+
+                bt = cls._spook_class(value[Spook.TYPE_FIELD])
+                if bt is None:
+                    raise RuntimeError(f"Non serializable data: {value}")
+                cache_key, entry = None, None
+                if getattr(bt, "cacheable", False):
+                    cache_key = Spook.INSTANCES_CACHE.key(value)
+                    if cache_key is not None:
+                        entry = Spook.INSTANCES_CACHE.get(cache_key)
+
+                if validate and (entry is None or not entry[1]):
+                    bt._validate_schema(value)
+                if entry is not None:
+                    entry[1] = entry[1] or validate
+                    obj = entry[0]
+                else:
+                    args = cls._create_tree(value[Spook.ARGS_FIELD], validate, memo)
+                    obj = bt.hydrate(
+                        {
+                            Spook.TYPE_FIELD: value[Spook.TYPE_FIELD],
+                            Spook.ARGS_FIELD: args,
+                        },
+                        validate=False,
+                    )
+                    if cache_key is not None:
+                        Spook.INSTANCES_CACHE.put(cache_key, obj, validate)
+                for key in keys:
+                    memo[key] = obj
+                return obj
+            return {k: cls._create_tree(v, validate, memo) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [cls._create_tree(v, validate, memo) for v in value]
+        return value
+
+    @classmethod
+    def create_many(
+        cls,
+        dicts: typing.Sequence[dict],
+        validate: bool = True,
+        workers: int = 0,
+        batch_size: int = 256,
+    ) -> typing.List[any]:
+        """Creates many objects starting from their serialized dicts. Dicts are grouped
+        by Spook type, each class is resolved and its schema retrieved once per group
+
+        :param dicts: serialized dicts
+        :type dicts: Sequence[dict]
+        :param validate: TRUE to validate dicts schema before hydratation, defaults to True
+        :type validate: bool, optional
+        :param workers: number of worker processes hydrating batches of dicts, useful for
+        expensive constructors. 0 or 1 to hydrate in the current process, defaults to 0
+        :type workers: int, optional
+        :param batch_size: dicts hydrated per worker task, defaults to 256
+        :type batch_size: int, optional
+        :raises RuntimeError: when a corresponding class is not registered in the factory map
+        :return: hydrated objects, in the same order of dicts
+        :rtype: List[any]
+        """
+        # Trusted mode is resolved here, worker processes may not share it
+        validate = validate and not Spook.TRUSTED
+        groups = {}
+        for index, d in enumerate(dicts):
+            groups.setdefault(d[Spook.TYPE_FIELD], []).append(index)
+
+        for name, indices in groups.items():
+            if cls._spook_class(name) is None:
+                raise RuntimeError(f"Non serializable data: {dicts[indices[0]]}")
+
+        out = [None] * len(dicts)
+        if workers > 1:
+            from concurrent.futures import ProcessPoolExecutor
+
+            batch_size = max(batch_size, 1)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = []
+                for name, indices in groups.items():
+                    for start in range(0, len(indices), batch_size):
+                        batch = indices[start : start + batch_size]
+                        args = (name, [dicts[i] for i in batch], validate)
+                        futures.append((batch, executor.submit(_hydrate_batch, *args)))
+                for batch, future in futures:
+                    for index, obj in zip(batch, future.result()):
+                        out[index] = obj
+        else:
+            for name, indices in groups.items():
+                objs = _hydrate_batch(name, [dicts[i] for i in indices], validate)
+                for index, obj in zip(indices, objs):
+                    out[index] = obj
+        return out
+
+    @classmethod
+    def _spook_class(cls, name: str) -> typing.Union[None, typing.Type[Spook]]:
+        """Retrieves the Spook class registered with a given name, importing it if needed
+
+        :param name: spook name (module....ClassName)
+        :type name: str
+        :raises RuntimeError: when the class cannot be imported
+        :return: spook class
+        :rtype: Union[None, Type[Spook]]
+        """
+        if name not in cls.SPOOKS_MAP:
+            module = MetaSpook.indexed_module(name)
+            if module is not None:
+                try:
+                    importlib.import_module(module)
+                except Exception as e:
+                    raise RuntimeError(
+                        f"SPOOK ALERT! Unable to import {module} module of {name}: {e}"
+                    )
+                if name in cls.SPOOKS_MAP:
+                    return cls.SPOOKS_MAP[name]
             try:
-                cls.SPOOKS_MAP[d[Spook.TYPE_FIELD]] = cls.dynamic_import(
-                    d[Spook.TYPE_FIELD]
-                )
+                imported = cls.dynamic_import(name)
             except Exception as e:
-                raise RuntimeError(
-                    f"SPOOK ALERT! Unable to import {d[Spook.TYPE_FIELD]} class: {e}"
+                raise RuntimeError(f"SPOOK ALERT! Unable to import {name} class: {e}")
+            with MetaSpook.LOCK:
+                MetaSpook.SPOOKS_MAP.setdefault(name, imported)
+        return cls.SPOOKS_MAP.get(name, None)
+
+
+def _proxy_method(fn: typing.Callable) -> typing.Callable:
+    def method(self, *args, **kwargs):
+        return fn(self.materialize(), *args, **kwargs)
+
+    return method
+
+
+class SpookProxy(object):
+    """Transparent proxy of a serialized Spook: the class import and the hydratation
+    are deferred until the first attribute access or call, or an explicit
+    `materialize()`. Materialization is thread safe and happens once
+
+    :param d: serialized dict
+    :type d: dict
+    :param validate: TRUE to validate dict schema before hydratation, defaults to True
+    :type validate: bool, optional
+    :param recursive: TRUE to hydrate nested Spooks, see `Spook.create`, defaults to False
+    :type recursive: bool, optional
+    """
+
+    __slots__ = ("_spook_data", "_spook_options", "_spook_target", "_spook_lock")
+
+    _UNSET = object()
+
+    def __init__(self, d: dict, validate: bool = True, recursive: bool = False):
+        object.__setattr__(self, "_spook_data", d)
+        object.__setattr__(self, "_spook_options", (validate, recursive))
+        object.__setattr__(self, "_spook_target", SpookProxy._UNSET)
+        object.__setattr__(self, "_spook_lock", threading.Lock())
+
+    @property
+    def spook_name(self) -> str:
+        """Name of the proxied Spook, available without materialization"""
+        return self._spook_data[Spook.TYPE_FIELD]
+
+    @property
+    def materialized(self) -> bool:
+        return self._spook_target is not SpookProxy._UNSET
+
+    def materialize(self) -> any:
+        """Hydrates the proxied Spook if not done yet
+
+        :return: hydrated object
+        :rtype: any
+        """
+        if self._spook_target is SpookProxy._UNSET:
+            with self._spook_lock:
+                if self._spook_target is SpookProxy._UNSET:
+                    validate, recursive = self._spook_options
+                    target = Spook.create(
+                        self._spook_data, validate=validate, recursive=recursive
+                    )
+                    object.__setattr__(self, "_spook_target", target)
+        return self._spook_target
+
+    @classmethod
+    def materialize_many(
+        cls, proxies: typing.Sequence[any], workers: int = 4
+    ) -> typing.List[any]:
+        """Eagerly materializes many proxies on a thread pool
+
+        :param proxies: proxies to materialize, other objects are returned as they are
+        :type proxies: Sequence[any]
+        :param workers: number of threads, defaults to 4
+        :type workers: int, optional
+        :return: hydrated objects, in the same order of proxies
+        :rtype: List[any]
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        def _materialize(x: any) -> any:
+            return x.materialize() if isinstance(x, SpookProxy) else x
+
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+            return list(executor.map(_materialize, proxies))
+
+    def __getattr__(self, name: str) -> any:
+        return getattr(self.materialize(), name)
+
+    def __setattr__(self, name: str, value: any):
+        setattr(self.materialize(), name, value)
+
+    def __delattr__(self, name: str):
+        delattr(self.materialize(), name)
+
+    def __repr__(self) -> str:
+        if self.materialized:
+            return repr(self._spook_target)
+        return f"<SpookProxy of {self.spook_name}>"
+
+    def __reduce_ex__(self, protocol: int) -> tuple:
+        # Pickled as the hydrated object if any, otherwise as a new lazy proxy
+        if self.materialized:
+            return self._spook_target.__reduce_ex__(protocol)
+        return SpookProxy, (self._spook_data, *self._spook_options)
+
+    def __deepcopy__(self, memo: dict) -> any:
+        if self.materialized:
+            return copy.deepcopy(self._spook_target, memo)
+        data = copy.deepcopy(self._spook_data, memo)
+        return SpookProxy(data, *self._spook_options)
+
+    # isinstance checks see the proxied class
+    __class__ = property(lambda self: self.materialize().__class__)
+
+    __call__ = _proxy_method(lambda x, *args, **kwargs: x(*args, **kwargs))
+    __eq__ = _proxy_method(operator.eq)
+    __ne__ = _proxy_method(operator.ne)
+    __hash__ = _proxy_method(hash)
+    __str__ = _proxy_method(str)
+    __bool__ = _proxy_method(bool)
+    __len__ = _proxy_method(len)
+    __iter__ = _proxy_method(iter)
+    __contains__ = _proxy_method(operator.contains)
+    __getitem__ = _proxy_method(operator.getitem)
+    __setitem__ = _proxy_method(operator.setitem)
+    __delitem__ = _proxy_method(operator.delitem)
+
+
+def _hydrate_batch(name: str, dicts: typing.Sequence[dict], validate: bool) -> list:
+    """Hydrates a batch of dicts of the same Spook type
+
+    :param name: spook name (module....ClassName)
+    :type name: str
+    :param dicts: serialized dicts
+    :type dicts: Sequence[dict]
+    :param validate: TRUE to validate dicts schema before hydratation
+    :type validate: bool
+    :return: hydrated objects
+    :rtype: list
+    """
+    bt = Spook._spook_class(name)
+    # Custom hydratations are honored, the default one is unrolled over the batch
+    if getattr(bt, "cacheable", False) or (
+        getattr(bt.hydrate, "__func__", None) is not Spook.hydrate.__func__
+    ):
+        return [_cached_hydrate(bt, d, validate) for d in dicts]
+
+    if validate:
+        schema, validated = MetaSpook.cached_schema(bt)
+        if validated:
+            for d in dicts:
+                schema.validate(d)
+    return [bt.from_dict(d[Spook.ARGS_FIELD]) for d in dicts]
+
+
+# Annotations coerced by `fast_spook` generated from_dict
+_FAST_SPOOK_CASTS = {
+    int: PlaceholderType.INT,
+    float: PlaceholderType.FLOAT,
+    str: PlaceholderType.STR,
+    bool: PlaceholderType.BOOL,
+    Path: PlaceholderType.PATH,
+}
+
+
+def fast_spook(cls: typing.Type[Spook]) -> typing.Type[Spook]:
+    """Class decorator generating specialized `to_dict`/`from_dict` of a Spook from its
+    constructor signature (or dataclass fields), inspected once:
+
+    - `to_dict` returns only the constructor fields, read from the attribute with the
+      same name or, if missing, with the private one (e.g. `name` or `_name`).
+      `__slots__` classes and dataclasses are supported
+    - `from_dict` passes only the constructor fields, applying defaults for missing
+      keys and coercing values annotated (or typed in `spook_schema`) as int, float,
+      str, bool or Path. Lossy casts to int (e.g. 2.9) raise ValueError
+
+    Methods explicitly defined by the class are kept. Subclasses with different
+    constructors must be decorated too
+
+    :param cls: Spook class
+    :type cls: Type[Spook]
+    :raises TypeError: if cls is not a Spook or its constructor has variadic arguments
+    :return: the same class
+    :rtype: Type[Spook]
+    """
+    if not isinstance(cls, MetaSpook):
+        raise TypeError(f"{cls.__name__} is not a Spook")
+
+    fields = _fast_spook_fields(cls)
+    if "from_dict" not in cls.__dict__:
+        cls.from_dict = classmethod(_fast_from_dict(cls, fields))
+    if "to_dict" not in cls.__dict__:
+        cls.to_dict = _fast_to_dict(cls, [f[0] for f in fields])
+    return cls
+
+
+def _fast_spook_fields(cls: typing.Type[Spook]) -> typing.List[tuple]:
+    """Inspects the constructor fields of a Spook
+
+    :return: list of (name, kind, default, default factory, type) where missing
+    defaults are `inspect.Parameter.empty`
+    :rtype: List[tuple]
+    """
+    empty = inspect.Parameter.empty
+    fields = []
+    if dataclasses.is_dataclass(cls):
+        hints = _type_hints(cls)
+        for f in dataclasses.fields(cls):
+            if not f.init:
+                continue
+            default = empty if f.default is dataclasses.MISSING else f.default
+            factory = None
+            if f.default_factory is not dataclasses.MISSING:
+                factory = f.default_factory
+            kind = inspect.Parameter.POSITIONAL_OR_KEYWORD
+            fields.append((f.name, kind, default, factory, hints.get(f.name)))
+    else:
+        hints = _type_hints(cls.__init__)
+        parameters = list(inspect.signature(cls.__init__).parameters.values())[1:]
+        for p in parameters:
+            if p.kind in (p.VAR_POSITIONAL, p.VAR_KEYWORD):
+                raise TypeError(
+                    f"{cls.__name__} constructor has variadic arguments, fields are "
+                    "unknown"
                 )
+            fields.append((p.name, p.kind, p.default, None, hints.get(p.name)))
 
-        if d[Spook.TYPE_FIELD] in cls.SPOOKS_MAP:
-            bt = cls.SPOOKS_MAP[d[Spook.TYPE_FIELD]]
-            return bt.hydrate(d, validate=validate)
-        raise RuntimeError(f"Non serializable data: {d}")
+    # Schema types are used for the fields without annotation
+    schema = cls.spook_schema()
+    if isinstance(schema, dict):
+        for index, (name, kind, default, factory, tp) in enumerate(fields):
+            if tp is None and name in schema:
+                fields[index] = (name, kind, default, factory, schema[name])
+    return fields
+
+
+def _type_hints(x: typing.Any) -> dict:
+    try:
+        return typing.get_type_hints(x)
+    except Exception:
+        return {}
+
+
+def _fast_cast(tp: type) -> typing.Callable[[typing.Any], typing.Any]:
+    """Builds the coercion of a field annotated with one of `_FAST_SPOOK_CASTS` types.
+    Casts to int refuse to drop decimals (e.g. 2.9) instead of truncating
+
+    :param tp: annotated type
+    :type tp: type
+    :return: cast function
+    :rtype: Callable[[Any], Any]
+    """
+    placeholder_type = _FAST_SPOOK_CASTS[tp]
+    if tp is not int:
+        return lambda value: PlaceholderType.cast(value, placeholder_type)
+
+    def _cast_int(value: typing.Any) -> int:
+        result = PlaceholderType.cast(value, placeholder_type)
+        if isinstance(value, numbers.Real) and result != value:
+            raise ValueError(f"Can not cast {value!r} to int without losing data")
+        return result
+
+    return _cast_int
+
+
+def _fast_from_dict(cls: typing.Type[Spook], fields: typing.List[tuple]):
+    namespace = {}
+    lines, args, kwargs = [], [], []
+    for index, (name, kind, default, factory, tp) in enumerate(fields):
+        var = f"_v{index}"
+        if factory is not None:
+            namespace[f"_f{index}"] = factory
+            lines.append(f"{var} = d[{name!r}] if {name!r} in d else _f{index}()")
+        elif default is not inspect.Parameter.empty:
+            namespace[f"_d{index}"] = default
+            lines.append(f"{var} = d.get({name!r}, _d{index})")
+        else:
+            lines.append(f"{var} = d[{name!r}]")
+
+        # Values already of the annotated type (or None) are not cast
+        if isinstance(tp, type) and tp in _FAST_SPOOK_CASTS:
+            namespace[f"_t{index}"] = tp
+            namespace[f"_c{index}"] = _fast_cast(tp)
+            lines.append(
+                f"if type({var}) is not _t{index} and {var} is not None: "
+                f"{var} = _c{index}({var})"
+            )
+
+        if kind == inspect.Parameter.POSITIONAL_ONLY:
+            args.append(var)
+        else:
+            kwargs.append(f"{name}={var}")
+
+    lines.append(f"return cls({', '.join(args + kwargs)})")
+    source = "def from_dict(cls, d):\n" + "".join(f"    {x}\n" for x in lines)
+    return _fast_compile(cls, source, namespace, "from_dict")
+
+
+def _fast_to_dict(cls: typing.Type[Spook], names: typing.List[str]):
+    attributes = None
+    if dataclasses.is_dataclass(cls):
+        attributes = list(names)
+    else:
+        slots = set()
+        for base in cls.__mro__:
+            base_slots = base.__dict__.get("__slots__", ())
+            slots.update([base_slots] if isinstance(base_slots, str) else base_slots)
+        if len(slots) > 0 and "__dict__" not in slots:
+            attributes = [n if n in slots else f"_{n}" for n in names]
+
+    if attributes is not None:
+        return _fast_to_dict_source(cls, names, attributes)
+
+    # Attributes of plain classes are resolved on the first serialized instance
+    def to_dict(self) -> dict:
+        attributes = [n if hasattr(self, n) else f"_{n}" for n in names]
+        fn = _fast_to_dict_source(cls, names, attributes)
+        cls.to_dict = fn
+        return fn(self)
+
+    return to_dict
+
+
+def _fast_to_dict_source(
+    cls: typing.Type[Spook], names: typing.List[str], attributes: typing.List[str]
+) -> typing.Callable:
+    items = ", ".join(f"{n!r}: self.{a}" for n, a in zip(names, attributes))
+    source = f"def to_dict(self):\n    return {{{items}}}\n"
+    return _fast_compile(cls, source, {}, "to_dict")
+
+
+def _fast_compile(
+    cls: typing.Type[Spook], source: str, namespace: dict, name: str
+) -> typing.Callable:
+    code = compile(source, f"<fast_spook {cls.__qualname__}.{name}>", "exec")
+    exec(code, namespace)
+    fn = namespace[name]
+    fn.__qualname__ = f"{cls.__qualname__}.{name}"
+    return fn
+
+
+def _cached_hydrate(bt: typing.Type[Spook], d: dict, validate: bool) -> any:
+    """Hydrates a serialized Spook, sharing the instances of `cacheable` Spooks
+
+    :param bt: spook class
+    :type bt: Type[Spook]
+    :param d: serialized dict
+    :type d: dict
+    :param validate: TRUE to validate dict schema before hydratation
+    :type validate: bool
+    :return: hydrated object
+    :rtype: any
+    """
+    if not getattr(bt, "cacheable", False):
+        return bt.hydrate(d, validate=validate)
+
+    key = Spook.INSTANCES_CACHE.key(d)
+    if key is None:
+        return bt.hydrate(d, validate=validate)
+
+    entry = Spook.INSTANCES_CACHE.get(key)
+    if entry is None:
+        obj = bt.hydrate(d, validate=validate)
+        Spook.INSTANCES_CACHE.put(key, obj, validate)
+        return obj
+
+    # Entries hydrated without validation are validated once, when requested
+    if validate and not entry[1]:
+        bt._validate_schema(d)
+        entry[1] = True
+    return entry[0]
@@ -1,5 +1,14 @@
+import ast
+import bisect
+import copy
+import functools
+import itertools
+import math
+import sys
+from collections.abc import Sequence as AbstractSequence
 from enum import Enum, auto
-from typing import Union
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
 from choixe.directives import (
     Directive,
     DirectiveConsumer,
@@ -9,6 +18,9 @@ from choixe.directives import (
 
 class SweeperType(Enum):
     SWEEP = auto()
+    SWEEP_RANGE = auto()
+    SWEEP_LINSPACE = auto()
+    SWEEP_LOGSPACE = auto()
 
     @classmethod
     def values(cls):
@@ -19,9 +31,130 @@ class SweeperType(Enum):
         return SweeperType[value.upper()]
 
 
+@functools.lru_cache(maxsize=1024)
+def _parse_sweep_arguments(value: str) -> Tuple[Tuple[any, ...], Dict[str, any]]:
+    """Parses the arguments of a SWEEP directive string as python literals
+
+    :param value: SWEEP directive string (e.g. '@sweep(1, "a", [2, 3], group=g)')
+    :type value: str
+    :raises ValueError: if an argument is not a python literal
+    :return: tuple of parsed values and dict of keyword arguments. A keyword value
+    can also be a plain name (e.g. group=g -> {'group': 'g'}). Results are cached and
+    shared by all the callers, they must not be modified
+    :rtype: Tuple[Tuple[any, ...], Dict[str, any]]
+    """
+
+    value = value.strip()
+    start, end = value.find("("), value.rfind(")")
+    try:
+        call = ast.parse(f"_({value[start + 1:end]})", mode="eval").body
+    except SyntaxError as e:
+        raise ValueError(f"Malformed sweep directive {value}: {e}")
+
+    values = []
+    for node in call.args:
+        try:
+            values.append(ast.literal_eval(node))
+        except ValueError:
+            raise ValueError(
+                f"Sweep options must be python literals (numbers, strings, bools, "
+                f"None, lists, tuples), invalid option in {value}"
+            )
+
+    kwargs = {}
+    for keyword in call.keywords:
+        if isinstance(keyword.value, ast.Name):
+            kwargs[keyword.arg] = keyword.value.id
+            continue
+        try:
+            kwargs[keyword.arg] = ast.literal_eval(keyword.value)
+        except ValueError:
+            raise ValueError(f"Invalid argument '{keyword.arg}' in {value}")
+    return tuple(values), kwargs
+
+
+class SweepRange(AbstractSequence):
+    """Lazy arithmetic progression of sweep values, like `range` but with float support"""
+
+    def __init__(self, start: float, stop: float, step: float = 1):
+        if step == 0:
+            raise ValueError("Sweep range step must not be zero")
+        self._start = start
+        self._step = step
+        self._length = max(0, math.ceil((stop - start) / step))
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: Union[int, slice]) -> any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(self._length)[index]]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError(f"Sweep index {index} out of range")
+        return self._start + index * self._step
+
+
+class SweepLinspace(AbstractSequence):
+    """Lazy evenly spaced sweep values in [start, stop], in log space (base 10) if
+    `log` is TRUE (e.g. SweepLinspace(-3, -1, 3, log=True) -> 0.001, 0.01, 0.1)"""
+
+    def __init__(self, start: float, stop: float, num: int, log: bool = False):
+        if not isinstance(num, int) or num < 0:
+            raise ValueError(f"Sweep linspace size must be a positive int, got {num}")
+        self._start = start
+        self._stop = stop
+        self._length = num
+        self._log = log
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: Union[int, slice]) -> any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(self._length)[index]]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError(f"Sweep index {index} out of range")
+
+        if self._length == 1:
+            value = float(self._start)
+        else:
+            t = index / (self._length - 1)
+            value = self._start * (1 - t) + self._stop * t
+        return 10.0**value if self._log else value
+
+
+class SweepChain(AbstractSequence):
+    """Lazy concatenation of sweep value sequences (e.g. literal options and the
+    variants of imported files), items are retrieved on demand"""
+
+    def __init__(self, sequences: Sequence[Sequence[any]]):
+        self._sequences = list(sequences)
+        self._offsets = list(itertools.accumulate(len(x) for x in self._sequences))
+
+    def __len__(self) -> int:
+        return self._offsets[-1] if len(self._offsets) > 0 else 0
+
+    def __getitem__(self, index: Union[int, slice]) -> any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(len(self))[index]]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"Sweep index {index} out of range")
+
+        position = bisect.bisect_right(self._offsets, index)
+        start = self._offsets[position - 1] if position > 0 else 0
+        return self._sequences[position][index - start]
+
+
 class Sweeper(DirectiveConsumer):
     def __init__(self, directive: Directive):
         super().__init__(directive=directive)
+        self._values = None
 
     def is_valid(self):
         if self._directive.valid:
@@ -40,3 +173,418 @@ class Sweeper(DirectiveConsumer):
         if self.is_valid():
             return self._directive.args[:]
         return []
+
+    @property
+    def type(self):
+        if self.is_valid():
+            return SweeperType.get_type(self._directive.label)
+        return None
+
+    def with_values(self, values: Sequence[any]) -> "Sweeper":
+        """Builds a copy of this sweeper with custom values (e.g. resolved imports)
+
+        :param values: new values
+        :type values: Sequence[any]
+        :return: new sweeper on the same directive
+        :rtype: Sweeper
+        """
+        sweeper = Sweeper(directive=self._directive)
+        sweeper._values = values
+        return sweeper
+
+    @property
+    def group(self) -> Optional[str]:
+        """Name of the sweep group, sites of the same group are swept together"""
+        if not self.is_valid():
+            return None
+        _, kwargs = _parse_sweep_arguments(self._directive.value)
+        group = kwargs.get("group", None)
+        return str(group) if group is not None else None
+
+    @property
+    def values(self) -> Sequence[any]:
+        """Sweep options parsed as python literals. Parsing is safe (no eval) and it is
+        done only once for each directive string, each sweeper gets its own copy of the
+        options. Range/linspace/logspace sweeps return a lazy sequence generating values
+        on demand
+
+        :raises ValueError: if an option is not a python literal
+        :return: parsed options
+        :rtype: Sequence[any]
+        """
+        if not self.is_valid():
+            return []
+        if self._values is None:
+            args, _ = _parse_sweep_arguments(self._directive.value)
+            try:
+                if self.type == SweeperType.SWEEP_RANGE:
+                    if all(isinstance(x, int) for x in args):
+                        self._values = range(*args)
+                    else:
+                        self._values = SweepRange(*args)
+                elif self.type == SweeperType.SWEEP_LINSPACE:
+                    self._values = SweepLinspace(*args)
+                elif self.type == SweeperType.SWEEP_LOGSPACE:
+                    self._values = SweepLinspace(*args, log=True)
+                else:
+                    # Mutable literals (lists, dicts) must not leak the parse cache
+                    self._values = copy.deepcopy(args)
+            except TypeError as e:
+                raise ValueError(
+                    f"Invalid arguments for sweep {self._directive.value}: {e}"
+                )
+        return self._values
+
+
+DirectiveFactory.register_consumer(SweeperType.values(), Sweeper)
+
+
+# python < 3.8 parses literals as Num, Str, Bytes and NameConstant nodes
+if sys.version_info < (3, 8):  # pragma: no cover
+    _LEGACY_LITERAL_NODES = (ast.Num, ast.Str, ast.Bytes, ast.NameConstant)
+else:
+    _LEGACY_LITERAL_NODES = ()
+
+
+class SweepConstraint(object):
+    """Predicate over sweep values used to prune invalid combinations
+
+    :param fn: predicate returning TRUE for valid combinations. If `keys` is given it
+    receives the values of those keys as positional arguments, otherwise it receives
+    a dict {dotted key: value} with the values of all the sweep sites
+    :type fn: Callable[..., bool]
+    :param keys: dotted keys referenced by the predicate, defaults to None
+    :type keys: Optional[Sequence[str]], optional
+    """
+
+    ALLOWED_NODES = (
+        ast.Expression,
+        ast.BoolOp,
+        ast.BinOp,
+        ast.UnaryOp,
+        ast.Compare,
+        ast.IfExp,
+        ast.Tuple,
+        ast.List,
+        ast.Constant,
+        ast.Name,
+        ast.Load,
+        ast.boolop,
+        ast.operator,
+        ast.unaryop,
+        ast.cmpop,
+    ) + _LEGACY_LITERAL_NODES
+
+    # Limits of the operators that could hang the sweep or exhaust memory ('**', '*',
+    # '<<'): exponent, bits of int results and length of repeated sequences
+    MAX_EXPONENT = 64
+    MAX_INT_BITS = 4096
+    MAX_SEQUENCE_LENGTH = 10000
+
+    def __init__(self, fn: Callable[..., bool], keys: Optional[Sequence[str]] = None):
+        self._fn = fn
+        self._keys = list(keys) if keys is not None else None
+
+    @property
+    def keys(self) -> Optional[List[str]]:
+        return self._keys
+
+    def check(self, values: Dict[str, any]) -> bool:
+        """Evaluates the predicate
+
+        :param values: bound values as {dotted key: value}
+        :type values: Dict[str, any]
+        :return: TRUE if the combination is valid
+        :rtype: bool
+        """
+        if self._keys is None:
+            return bool(self._fn(values))
+        return bool(self._fn(*[values[k] for k in self._keys]))
+
+    @classmethod
+    def from_expression(cls, expression: str) -> "SweepConstraint":
+        """Builds a constraint from a simple python expression where names are dotted
+        keys of the configuration (e.g. 'model.hidden % model.heads == 0'). List items
+        are referenced with subscripts (e.g. 'layers[0].size > 2'). Only arithmetic,
+        comparisons and boolean operators are allowed
+
+        :param expression: constraint expression
+        :type expression: str
+        :raises ValueError: if the expression is malformed or not allowed
+        :return: built constraint
+        :rtype: SweepConstraint
+        """
+
+        try:
+            tree = ast.parse(expression.strip(), mode="eval")
+        except SyntaxError as e:
+            raise ValueError(f"Malformed sweep constraint '{expression}': {e}")
+
+        keys = []
+
+        class _KeysReplacer(ast.NodeTransformer):
+            def _key(self, node: ast.AST) -> Optional[List[str]]:
+                if isinstance(node, ast.Name):
+                    return [node.id]
+                if isinstance(node, ast.Attribute):
+                    key = self._key(node.value)
+                    return key + [node.attr] if key is not None else None
+                if isinstance(node, ast.Subscript):
+                    index = node.slice
+                    # python < 3.9 wraps subscripts in ast.Index
+                    if type(index).__name__ == "Index":
+                        index = index.value
+                    if isinstance(index, (ast.Constant,) + _LEGACY_LITERAL_NODES):
+                        key = self._key(node.value)
+                        value = ast.literal_eval(index)
+                        return key + [str(value)] if key is not None else None
+                return None
+
+            def _replace(self, node: ast.AST) -> ast.AST:
+                key = self._key(node)
+                if key is None:
+                    return self.generic_visit(node)
+                key = ".".join(key)
+                if key not in keys:
+                    keys.append(key)
+                return ast.copy_location(
+                    ast.Name(id=f"_k{keys.index(key)}", ctx=ast.Load()), node
+                )
+
+            visit_Name = visit_Attribute = visit_Subscript = _replace
+
+        tree = ast.fix_missing_locations(_KeysReplacer().visit(tree))
+        for node in ast.walk(tree):
+            if not isinstance(node, cls.ALLOWED_NODES):
+                raise ValueError(
+                    f"Sweep constraint '{expression}' contains a not allowed "
+                    f"{type(node).__name__} expression"
+                )
+
+        guarded = {ast.Pow: "_pow", ast.Mult: "_mul", ast.LShift: "_lshift"}
+
+        class _GuardsReplacer(ast.NodeTransformer):
+            def visit_BinOp(self, node: ast.BinOp) -> ast.AST:
+                node = self.generic_visit(node)
+                if type(node.op) not in guarded:
+                    return node
+                call = ast.Call(
+                    func=ast.Name(id=guarded[type(node.op)], ctx=ast.Load()),
+                    args=[node.left, node.right],
+                    keywords=[],
+                )
+                return ast.copy_location(call, node)
+
+        tree = ast.fix_missing_locations(_GuardsReplacer().visit(tree))
+        code = compile(tree, "<sweep-constraint>", "eval")
+        names = [f"_k{i}" for i in range(len(keys))]
+        scope = {
+            "__builtins__": {},
+            "_pow": cls._guarded_pow,
+            "_mul": cls._guarded_mul,
+            "_lshift": cls._guarded_lshift,
+        }
+
+        def _fn(*args):
+            return eval(code, scope, dict(zip(names, args)))
+
+        return cls(_fn, keys=keys)
+
+    @classmethod
+    def _check_bits(cls, bits: int):
+        if bits > cls.MAX_INT_BITS:
+            raise ValueError(
+                f"Sweep constraint result exceeds {cls.MAX_INT_BITS} bits ({bits})"
+            )
+
+    @classmethod
+    def _guarded_pow(cls, base: any, exponent: any) -> any:
+        if abs(exponent) > cls.MAX_EXPONENT:
+            raise ValueError(
+                f"Sweep constraint exponent {exponent} exceeds {cls.MAX_EXPONENT}"
+            )
+        if isinstance(base, int) and isinstance(exponent, int):
+            cls._check_bits(base.bit_length() * exponent)
+        return base**exponent
+
+    @classmethod
+    def _guarded_mul(cls, a: any, b: any) -> any:
+        if isinstance(a, int) and isinstance(b, int):
+            cls._check_bits(a.bit_length() + b.bit_length())
+        elif isinstance(a, int) or isinstance(b, int):
+            sequence, times = (b, a) if isinstance(a, int) else (a, b)
+            if isinstance(sequence, (str, bytes, list, tuple)):
+                if len(sequence) * times > cls.MAX_SEQUENCE_LENGTH:
+                    raise ValueError(
+                        f"Sweep constraint sequence exceeds {cls.MAX_SEQUENCE_LENGTH} "
+                        "items"
+                    )
+        return a * b
+
+    @classmethod
+    def _guarded_lshift(cls, a: any, b: any) -> any:
+        if isinstance(a, int) and isinstance(b, int):
+            cls._check_bits(a.bit_length() + b)
+        return a << b
+
+    @classmethod
+    def build(
+        cls, constraint: Union[str, Callable[..., bool], "SweepConstraint"]
+    ) -> "SweepConstraint":
+        """Builds a constraint from an expression, a callable or a constraint
+
+        :param constraint: source constraint
+        :type constraint: Union[str, Callable[..., bool], SweepConstraint]
+        :raises ValueError: if constraint type is not managed
+        :return: built constraint
+        :rtype: SweepConstraint
+        """
+        if isinstance(constraint, SweepConstraint):
+            return constraint
+        elif isinstance(constraint, str):
+            return cls.from_expression(constraint)
+        elif callable(constraint):
+            return cls(constraint)
+        raise ValueError(f"Invalid sweep constraint: {constraint}")
+
+
+class SweepSamplingMethod(Enum):
+    RANDOM = auto()
+    LHS = auto()
+    SOBOL = auto()
+
+    @classmethod
+    def values(cls):
+        return list([c.name.lower() for c in cls])
+
+    @classmethod
+    def get_type(cls, value: str) -> Union["SweepSamplingMethod", None]:
+        return SweepSamplingMethod[value.upper()]
+
+
+class SweepSampler(object):
+    """Draws combinations of sweep options without enumerating the whole grid"""
+
+    SOBOL_BITS = 32
+
+    # Joe-Kuo direction numbers (new-joe-kuo-6.21201), dimensions 2..21 as (s, a, m)
+    SOBOL_DIRECTIONS = [
+        (1, 0, [1]),
+        (2, 1, [1, 3]),
+        (3, 1, [1, 3, 1]),
+        (3, 2, [1, 1, 1]),
+        (4, 1, [1, 1, 3, 3]),
+        (4, 4, [1, 3, 5, 13]),
+        (5, 2, [1, 1, 5, 5, 17]),
+        (5, 4, [1, 1, 5, 5, 5]),
+        (5, 7, [1, 1, 7, 11, 19]),
+        (5, 11, [1, 1, 5, 1, 1]),
+        (5, 13, [1, 1, 1, 3, 11]),
+        (5, 14, [1, 3, 5, 5, 31]),
+        (6, 1, [1, 3, 3, 9, 7, 49]),
+        (6, 13, [1, 1, 1, 15, 21, 21]),
+        (6, 16, [1, 3, 1, 13, 27, 49]),
+        (6, 19, [1, 1, 1, 15, 7, 5]),
+        (6, 22, [1, 3, 1, 15, 13, 25]),
+        (6, 25, [1, 1, 5, 5, 19, 61]),
+        (7, 1, [1, 3, 7, 11, 23, 15, 103]),
+        (7, 4, [1, 3, 7, 13, 13, 15, 69]),
+    ]
+
+    @classmethod
+    def sample(
+        cls,
+        sizes: Sequence[int],
+        n: int,
+        method: Union[str, SweepSamplingMethod] = SweepSamplingMethod.RANDOM,
+        seed: Optional[int] = None,
+    ) -> np.ndarray:
+        """Samples `n` combinations of option indices
+
+        :param sizes: number of options of each sweep dimension
+        :type sizes: Sequence[int]
+        :param n: number of combinations to draw
+        :type n: int
+        :param method: sampling method [random, lhs, sobol], defaults to random
+        :type method: Union[str, SweepSamplingMethod], optional
+        :param seed: random seed, defaults to None
+        :type seed: Optional[int], optional
+        :raises NotImplementedError: if sampling method is not managed yet
+        :raises ValueError: if sobol sampling is requested on too many dimensions
+        :return: (n, len(sizes)) array of option indices. Without dimensions the only
+        combination is drawn once: a (1, 0) array
+        :rtype: np.ndarray
+        """
+
+        if isinstance(method, str):
+            method = SweepSamplingMethod.get_type(method)
+
+        if len(sizes) == 0:
+            return np.zeros((min(n, 1), 0), dtype=np.int64)
+
+        rng = np.random.default_rng(seed)
+        if method == SweepSamplingMethod.RANDOM:
+            units = rng.random((n, len(sizes)))
+        elif method == SweepSamplingMethod.LHS:
+            units = cls._latin_hypercube(n, len(sizes), rng)
+        elif method == SweepSamplingMethod.SOBOL:
+            units = cls._sobol(n, len(sizes), rng if seed is not None else None)
+        else:
+            raise NotImplementedError(f"Sampling method {method} not implemented yet!")
+
+        sizes = np.asarray(sizes, dtype=np.int64).reshape(1, -1)
+        return np.minimum((units * sizes).astype(np.int64), sizes - 1)
+
+    @classmethod
+    def _latin_hypercube(cls, n: int, d: int, rng: np.random.Generator) -> np.ndarray:
+        # One random point in each of the n strata, strata shuffled per dimension
+        strata = np.argsort(rng.random((n, d)), axis=0)
+        return (strata + rng.random((n, d))) / n
+
+    @classmethod
+    def _sobol_direction_numbers(cls, d: int) -> np.ndarray:
+        bits = cls.SOBOL_BITS
+        directions = np.zeros((d, bits), dtype=np.uint64)
+        directions[0] = [1 << (bits - 1 - k) for k in range(bits)]
+        for j in range(1, d):
+            s, a, m = cls.SOBOL_DIRECTIONS[j - 1]
+            v = [m[k] << (bits - 1 - k) for k in range(s)]
+            for k in range(s, bits):
+                x = v[k - s] ^ (v[k - s] >> s)
+                for i in range(1, s):
+                    if (a >> (s - 1 - i)) & 1:
+                        x ^= v[k - i]
+                v.append(x)
+            directions[j] = v
+        return directions
+
+    @classmethod
+    def _sobol(
+        cls, n: int, d: int, rng: Optional[np.random.Generator] = None
+    ) -> np.ndarray:
+        """Sobol points in gray code order, randomized with a digital shift if a
+        random generator is provided
+
+        :raises ValueError: if too many dimensions are requested
+        """
+
+        if d > len(cls.SOBOL_DIRECTIONS) + 1:
+            raise ValueError(
+                f"Sobol sampling supports up to {len(cls.SOBOL_DIRECTIONS) + 1} "
+                f"sweep dimensions, {d} requested: use the random or lhs method"
+            )
+
+        directions = cls._sobol_direction_numbers(d)
+        points = np.zeros((n, d), dtype=np.uint64)
+        current = np.zeros(d, dtype=np.uint64)
+        for i in range(1, n):
+            # Index of the lowest zero bit of i - 1
+            c = ((i - 1) ^ i).bit_length() - 1
+            current = current ^ directions[:, c]
+            points[i] = current
+
+        if rng is not None:
+            shift = rng.integers(0, 1 << cls.SOBOL_BITS, size=d, dtype=np.uint64)
+            points = points ^ shift
+
+        return points.astype(np.float64) / float(1 << cls.SOBOL_BITS)
@@ -0,0 +1,216 @@
+import csv
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Sequence, Set, Tuple, Union
+import numpy as np
+from choixe.configurations import XConfig
+from choixe.interpolations import Interpolation
+from choixe.placeholders import Placeholder, PlaceholderType
+
+# Marks the values missing in a table row
+_MISSING = object()
+
+
+class _TemplateSlot(object):
+    __slots__ = ("name", "type")
+
+    def __init__(self, placeholder: Placeholder):
+        self.name = placeholder.name
+        self.type = placeholder.type
+
+
+class _InterpolatedSlot(object):
+    __slots__ = ("interpolation", "keys")
+
+    def __init__(self, interpolation: Interpolation):
+        self.interpolation = interpolation
+        self.keys = [(p.name, p.type) for p in interpolation.placeholders]
+
+
+class XConfigTemplate(object):
+    def __init__(self, cfg: XConfig):
+        """Precompiled configuration template. Placeholder locations are recorded once,
+        each render copies only the nodes on the path to a placeholder while all the
+        placeholder-free subtrees are shared with the template
+
+        :param cfg: source configuration
+        :type cfg: XConfig
+        """
+
+        self._filename = cfg._filename
+        self._schema = cfg.get_schema()
+        self._data = XConfig.decode(cfg.to_dict(discard_private_qualifiers=True))
+
+        # Trie of keys leading to placeholders, leaves are slots (name, type)
+        self._slots = {}
+        self._types = {}
+        # Like `replace_variables_map`, a default value applies to all the
+        # placeholders sharing the same name
+        self._defaults = {}
+        for chunk_name, value in cfg.chunks_as_lists(discard_private_qualifiers=True):
+            if cfg.is_a_placeholder(value):
+                placeholders = [Placeholder.from_string(value)]
+                slot = _TemplateSlot(placeholders[0])
+            else:
+                interpolation = Interpolation.from_string(value)
+                if interpolation is None:
+                    continue
+                placeholders = interpolation.placeholders
+                slot = _InterpolatedSlot(interpolation)
+            node, data = self._slots, self._data
+            for key in chunk_name[:-1]:
+                key = int(key) if isinstance(data, list) else key
+                node, data = node.setdefault(key, {}), data[key]
+            key = int(chunk_name[-1]) if isinstance(data, list) else chunk_name[-1]
+            node[key] = slot
+            for placeholder in placeholders:
+                types = self._types.setdefault(placeholder.name, [])
+                if placeholder.type not in types:
+                    types.append(placeholder.type)
+                if placeholder.default_value is not None:
+                    self._defaults[placeholder.name] = placeholder.default_value
+
+    @property
+    def names(self) -> Set[str]:
+        """Names of the placeholders of the template"""
+        return set(self._types.keys())
+
+    def render(
+        self, m: dict, replace_defaults: bool = False, as_dict: bool = False
+    ) -> Union[XConfig, Dict[str, Any]]:
+        """Renders the template replacing placeholders with new values, the same as
+        `copy()` followed by `replace_variables_map` on the source XConfig
+
+        :param m: dict of key/value = placeholder name/new value
+        :type m: dict
+        :param replace_defaults: TRUE to auto-replace default values remained
+        :type replace_defaults: bool
+        :param as_dict: TRUE to return a plain dict sharing placeholder-free subtrees
+        with the template (do not modify them in place), defaults to False
+        :type as_dict: bool, optional
+        :return: rendered configuration
+        :rtype: Union[XConfig, Dict[str, Any]]
+        """
+
+        if replace_defaults:
+            m = {**self._defaults, **m}
+        typed = {
+            (name, tp): PlaceholderType.cast(value, tp)
+            for name, value in m.items()
+            for tp in self._types.get(name, [])
+        }
+        return self._build(self._render(self._data, self._slots, typed), as_dict)
+
+    def render_table(
+        self,
+        table: Union[str, Path, Sequence[dict], np.ndarray],
+        replace_defaults: bool = False,
+        as_dict: bool = False,
+    ) -> Iterator[Union[XConfig, Dict[str, Any]]]:
+        """Lazily renders the template once for each row of a table whose columns are
+        placeholder names. Values are cast column-wise, once for each placeholder type
+
+        :param table: CSV filename, list of dicts or structured numpy array
+        :type table: Union[str, Path, Sequence[dict], np.ndarray]
+        :param replace_defaults: TRUE to auto-replace default values remained
+        :type replace_defaults: bool
+        :param as_dict: TRUE to render plain dicts, see `render`, defaults to False
+        :type as_dict: bool, optional
+        :return: iterator over rendered configurations, in rows order
+        :rtype: Iterator[Union[XConfig, Dict[str, Any]]]
+        """
+
+        columns, length = self.table_columns(table)
+
+        typed_columns = {}
+        for name, values in columns.items():
+            for tp in self._types.get(name, []):
+                typed_columns[(name, tp)] = self._cast_column(values, tp)
+
+        typed_defaults = {}
+        if replace_defaults:
+            for name, value in self._defaults.items():
+                for tp in self._types[name]:
+                    typed_defaults[(name, tp)] = PlaceholderType.cast(value, tp)
+
+        for index in range(length):
+            typed = dict(typed_defaults)
+            for key, column in typed_columns.items():
+                if column[index] is not _MISSING:
+                    typed[key] = column[index]
+            yield self._build(self._render(self._data, self._slots, typed), as_dict)
+
+    @classmethod
+    def table_columns(
+        cls, table: Union[str, Path, Sequence[dict], np.ndarray]
+    ) -> Tuple[Dict[str, List[Any]], int]:
+        """Converts a table into columns
+
+        :param table: CSV filename, list of dicts or structured numpy array
+        :type table: Union[str, Path, Sequence[dict], np.ndarray]
+        :raises ValueError: if table type is not managed
+        :return: dict of column name -> values and number of rows. Values missing in a
+        row of a list of dicts are marked so that they are not replaced
+        :rtype: Tuple[Dict[str, List[Any]], int]
+        """
+
+        if isinstance(table, (str, Path)):
+            with open(table, "r", newline="") as f:
+                table = list(csv.DictReader(f))
+
+        if isinstance(table, np.ndarray):
+            if table.dtype.names is None:
+                raise ValueError("Numpy tables must be structured arrays")
+            columns = {name: table[name].tolist() for name in table.dtype.names}
+            return columns, len(table)
+
+        if isinstance(table, Sequence):
+            columns = {}
+            for index, row in enumerate(table):
+                for name, value in row.items():
+                    column = columns.setdefault(name, [_MISSING] * len(table))
+                    column[index] = value
+            return columns, len(table)
+
+        raise ValueError(f"Table type {type(table)} not supported")
+
+    @classmethod
+    def _cast_column(cls, values: List[Any], tp: PlaceholderType) -> List[Any]:
+        present = [i for i, v in enumerate(values) if v is not _MISSING]
+        if len(present) == len(values):
+            return PlaceholderType.cast_many(values, tp)
+        column = list(values)
+        cast = PlaceholderType.cast_many([values[i] for i in present], tp)
+        for i, v in zip(present, cast):
+            column[i] = v
+        return column
+
+    def _build(
+        self, data: Dict[str, Any], as_dict: bool
+    ) -> Union[XConfig, Dict[str, Any]]:
+        if as_dict:
+            return data
+        cfg = XConfig.from_dict(data, no_deep_parse=True)
+        cfg._filename = self._filename
+        cfg.set_schema(self._schema)
+        return cfg
+
+    @classmethod
+    def _render(
+        cls,
+        data: Union[dict, list],
+        slots: Dict[Any, Any],
+        typed: Dict[Tuple[str, PlaceholderType], Any],
+    ) -> Union[dict, list]:
+        out = dict(data) if isinstance(data, dict) else list(data)
+        for key, slot in slots.items():
+            if isinstance(slot, _TemplateSlot):
+                if (slot.name, slot.type) in typed:
+                    out[key] = typed[(slot.name, slot.type)]
+            elif isinstance(slot, _InterpolatedSlot):
+                values = {
+                    index: typed[k] for index, k in enumerate(slot.keys) if k in typed
+                }
+                out[key] = slot.interpolation.join(values)
+            else:
+                out[key] = cls._render(data[key], slot, typed)
+        return out
@@ -0,0 +1,48 @@
+import timeit
+from dataclasses import dataclass
+import rich
+from rich.table import Table
+from choixe.spooks import Spook, fast_spook
+
+
+@dataclass
+class Transform(Spook):
+    name: str
+    p: float = 0.5
+    size: int = 256
+    enabled: bool = True
+
+    def to_dict(self) -> dict:
+        # Generic path, the default Spook.to_dict would expose all the instance dict
+        return dict(self.__dict__)
+
+
+# Same Spook with generated to_dict/from_dict
+@fast_spook
+@dataclass
+class FastTransform(Spook):
+    name: str
+    p: float = 0.5
+    size: int = 256
+    enabled: bool = True
+
+
+number = 100000
+table = Table(show_header=True, header_style="bold magenta")
+table.add_column("Operation")
+table.add_column("Generic (us)")
+table.add_column("Generated (us)")
+
+for operation, fn in [
+    ("to_dict", lambda x: x.to_dict()),
+    ("from_dict", lambda x: type(x).from_dict({"name": "flip", "p": 0.1, "size": 64})),
+    ("serialize", lambda x: x.serialize(validate=False)),
+    ("create", lambda x: Spook.create(x.serialize(validate=False), validate=False)),
+]:
+    timings = []
+    for obj in [Transform("flip", 0.1, 64), FastTransform("flip", 0.1, 64)]:
+        seconds = timeit.timeit(lambda: fn(obj), number=number)
+        timings.append(f"{seconds / number * 1e6:.3f}")
+    table.add_row(operation, *timings)
+
+rich.print(table)
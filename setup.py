@@ -40,6 +40,9 @@ setup(
         ],
     },
     install_requires=requirements,
+    extras_require={
+        "msgpack": ["msgpack"],
+    },
     license="GNU General Public License v3",
     long_description=readme,
     include_package_data=True,
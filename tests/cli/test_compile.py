@@ -53,3 +53,20 @@ def test_compile_wrong(sample_configurations_data, tmpdir):
 
         result = runner.invoke(compile, ["-c", filename, "-o", outfile])
         assert result.exit_code == 1
+
+
+def test_compile_inline_placeholders(tmpdir):
+    from choixe.configurations import XConfig
+
+    runner = CliRunner()
+    filename = Path(tmpdir) / "cfg.yml"
+    XConfig.from_dict(
+        {"a": {"b": "/data/@str(dataset)/@int(fold)/train"}, "c": "@int(c)"}
+    ).save_to(filename)
+
+    outfile = Path(tmpdir) / "out.yml"
+    args = ["-c", filename, "-o", outfile, "--option", "a.b[1]", "3"]
+    args += ["--option", "a.b[0]", "mnist", "--option", "c", "2"]
+    result = runner.invoke(compile, args)
+    assert result.exit_code == 0
+    assert XConfig(outfile).to_dict() == {"a": {"b": "/data/mnist/3/train"}, "c": 2}
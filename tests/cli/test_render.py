@@ -0,0 +1,58 @@
+from click.testing import CliRunner
+from choixe.cli.render import render
+from choixe.configurations import XConfig
+from pathlib import Path
+import json
+
+
+def test_render(tmpdir):
+    runner = CliRunner()
+    folder = Path(tmpdir)
+
+    cfg = XConfig.from_dict(
+        {"dataset": {"name": "@str(name)", "size": "@int(size, default=10)"}, "a": 1}
+    )
+    cfg.save_to(folder / "cfg.yml")
+    (folder / "table.csv").write_text("name,size\nfirst,1\nsecond,2\nthird,3\n")
+
+    for fmt in ["yml", "jsonl"]:
+        for workers in [1, 2]:
+            output_folder = folder / f"{fmt}_{workers}"
+            args = ["-c", folder / "cfg.yml", "-t", folder / "table.csv"]
+            args += ["-o", output_folder, "--format", fmt, "--workers", workers]
+            args += ["--batch_size", 2]
+            result = runner.invoke(render, args)
+            assert result.exit_code == 0
+
+            manifest = json.loads((output_folder / "manifest.json").read_text())
+            variants = manifest["variants"]
+            assert [x["index"] for x in variants] == [0, 1, 2]
+
+            if fmt == "jsonl":
+                lines = (output_folder / "render.jsonl").read_text().splitlines()
+                loaded = [json.loads(x) for x in lines]
+            else:
+                loaded = [
+                    XConfig(output_folder / x["file"]).to_dict() for x in variants
+                ]
+            assert [x["dataset"] for x in loaded] == [
+                {"name": "first", "size": 1},
+                {"name": "second", "size": 2},
+                {"name": "third", "size": 3},
+            ]
+
+
+def test_render_wrong(tmpdir):
+    runner = CliRunner()
+    folder = Path(tmpdir)
+    XConfig.from_dict({"a": "@int(a)"}).save_to(folder / "cfg.yml")
+
+    args = ["-c", folder / "cfg.yml", "-t", folder / "missing.csv", "-o", folder]
+    assert runner.invoke(render, args).exit_code == 1
+
+    (folder / "table.csv").write_text("a\nnot_an_int\n")
+    args = ["-c", folder / "cfg.yml", "-t", folder / "table.csv", "-o", folder]
+    assert runner.invoke(render, args).exit_code == 1
+
+    args = ["-c", folder / "missing.yml", "-t", folder / "table.csv", "-o", folder]
+    assert runner.invoke(render, args).exit_code == 1
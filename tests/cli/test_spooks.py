@@ -0,0 +1,20 @@
+import json
+from click.testing import CliRunner
+from choixe.cli.spooks import spooks
+from pathlib import Path
+
+
+def test_spooks_index(tmpdir):
+    runner = CliRunner()
+    output_file = Path(tmpdir) / "index.json"
+
+    result = runner.invoke(spooks, ["-m", "tests.test_spooks", "-o", output_file])
+    assert result.exit_code == 0
+
+    with open(output_file, "r") as f:
+        index = json.load(f)
+    assert index["tests.test_spooks.CustomUserObject__"] == "tests.test_spooks"
+    assert all(module == "tests.test_spooks" for module in index.values())
+
+    result = runner.invoke(spooks, ["-m", "not_a_module", "-o", output_file])
+    assert result.exit_code == 1
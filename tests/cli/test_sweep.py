@@ -0,0 +1,143 @@
+from click.testing import CliRunner
+from choixe.cli.sweep import sweep
+from choixe.configurations import XConfig
+from pathlib import Path
+
+
+def _sweep_cfg_file(folder: Path) -> Path:
+    cfg = XConfig.from_dict(
+        {"a": "@sweep(1, 2, 3)", "b": {"c": "@sweep(4, 5)"}, "d": "constant"}
+    )
+    filename = folder / "cfg.yml"
+    cfg.save_to(filename)
+    return filename
+
+
+def test_sweep(tmpdir):
+    runner = CliRunner()
+    filename = _sweep_cfg_file(Path(tmpdir))
+
+    output_folder = Path(tmpdir) / "out"
+    result = runner.invoke(sweep, ["-c", filename, "-o", output_folder])
+    assert result.exit_code == 0
+    assert len(list(output_folder.glob("*.yml"))) == 6
+
+    sharded_folder = Path(tmpdir) / "sharded"
+    for k in range(4):
+        result = runner.invoke(
+            sweep, ["-c", filename, "-o", sharded_folder, "--shard", f"{k}/4"]
+        )
+        assert result.exit_code == 0
+
+    expected = sorted(x.name for x in output_folder.glob("*.yml"))
+    assert sorted(x.name for x in sharded_folder.glob("*.yml")) == expected
+    for name in expected:
+        assert (
+            XConfig(output_folder / name).to_dict()
+            == XConfig(sharded_folder / name).to_dict()
+        )
+
+
+def test_sweep_wrong(tmpdir):
+    runner = CliRunner()
+    filename = _sweep_cfg_file(Path(tmpdir))
+    output_folder = Path(tmpdir) / "out"
+
+    for shard in ["4/4", "a/b", "1"]:
+        result = runner.invoke(
+            sweep, ["-c", filename, "-o", output_folder, "--shard", shard]
+        )
+        assert result.exit_code == 1
+
+    result = runner.invoke(sweep, ["-c", f"{filename}@IMPOSSIBLE", "-o", output_folder])
+    assert result.exit_code == 1
+
+
+def test_sweep_sample(tmpdir):
+    runner = CliRunner()
+    filename = _sweep_cfg_file(Path(tmpdir))
+
+    for method in ["random", "lhs", "sobol"]:
+        output_folder = Path(tmpdir) / method
+        args = ["-c", filename, "-o", output_folder, "--sample", 4]
+        args += ["--method", method, "--seed", 7]
+        result = runner.invoke(sweep, args)
+        assert result.exit_code == 0
+        assert len(list(output_folder.glob("*.yml"))) == 4
+
+    result = runner.invoke(
+        sweep, ["-c", filename, "-o", tmpdir, "--sample", 4, "--shard", "0/2"]
+    )
+    assert result.exit_code == 1
+
+    result = runner.invoke(
+        sweep, ["-c", filename, "-o", tmpdir, "--sample", 4, "--constraint", "a > 1"]
+    )
+    assert result.exit_code == 1
+
+    # Too many dimensions for sobol sampling
+    many = XConfig.from_dict({f"p{i}": "@sweep(1, 2)" for i in range(30)})
+    many.save_to(Path(tmpdir) / "many.yml")
+    args = ["-c", Path(tmpdir) / "many.yml", "-o", Path(tmpdir) / "many"]
+    result = runner.invoke(sweep, args + ["--sample", 4, "--method", "sobol"])
+    assert result.exit_code == 1
+    assert not isinstance(result.exception, ValueError)
+
+    # Without sweeps the only variant is sampled
+    plain = Path(tmpdir) / "plain.yml"
+    XConfig.from_dict({"a": 1}).save_to(plain)
+    output_folder = Path(tmpdir) / "plain"
+    args = ["-c", plain, "-o", output_folder, "--sample", 4, "--method", "sobol"]
+    result = runner.invoke(sweep, args)
+    assert result.exit_code == 0
+    assert len(list(output_folder.glob("*.yml"))) == 1
+
+
+def test_sweep_parallel(tmpdir):
+    import json
+
+    runner = CliRunner()
+    filename = _sweep_cfg_file(Path(tmpdir))
+    expected = [x.to_dict() for x in XConfig(filename).sweep()]
+
+    for fmt in ["yml", "json", "jsonl"]:
+        output_folder = Path(tmpdir) / fmt
+        args = ["-c", filename, "-o", output_folder, "--format", fmt]
+        args += ["--workers", 2, "--batch_size", 1]
+        result = runner.invoke(sweep, args)
+        assert result.exit_code == 0
+
+        manifest = json.loads((output_folder / "manifest.json").read_text())
+        variants = manifest["variants"]
+        assert [x["index"] for x in variants] == list(range(len(expected)))
+
+        if fmt == "jsonl":
+            lines = (output_folder / "sweep.jsonl").read_text().splitlines()
+            loaded = [json.loads(x) for x in lines]
+        else:
+            loaded = [XConfig(output_folder / x["file"]).to_dict() for x in variants]
+        assert loaded == expected
+        assert [x["fingerprint"] for x in variants] == [
+            XConfig.from_dict(x).fingerprint() for x in expected
+        ]
+
+    output_folder = Path(tmpdir) / "constrained"
+    args = ["-c", filename, "-o", output_folder, "--constraint", "a + b.c > 6"]
+    result = runner.invoke(sweep, args)
+    assert result.exit_code == 0
+    assert len(list(output_folder.glob("*.yml"))) == 3
+
+    # Constrained variants keep the name of their index in the whole sweep
+    cfg = XConfig(filename)
+    manifest = json.loads((output_folder / "manifest.json").read_text())
+    assert [x["index"] for x in manifest["variants"]] == [3, 4, 5]
+    for entry in manifest["variants"]:
+        assert entry["file"] == f"sweep_{str(entry['index']).zfill(5)}.yml"
+        assert (
+            XConfig(output_folder / entry["file"]).to_dict()
+            == cfg.sweep_at(entry["index"]).to_dict()
+        )
+
+    args = ["-c", filename, "-o", output_folder, "--constraint", "a + missing"]
+    result = runner.invoke(sweep, args)
+    assert result.exit_code == 1
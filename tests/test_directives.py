@@ -0,0 +1,64 @@
+from choixe.configurations import XConfig
+from choixe.directives import DirectiveConsumer, DirectiveFactory
+from choixe.importers import Importer
+from choixe.placeholders import Placeholder
+from choixe.sweepers import Sweeper
+
+
+class Banner(DirectiveConsumer):
+    def is_valid(self) -> bool:
+        return self.directive.label == "banner"
+
+
+class TestDirectiveFactory:
+    def test_typed_consumers(self):
+
+        assert isinstance(
+            DirectiveFactory.build_consumer_from_string("@int(a)"), Placeholder
+        )
+        assert isinstance(
+            DirectiveFactory.build_consumer_from_string("@import(a.yml)"), Importer
+        )
+        for directive in [
+            "@sweep(1, 2)",
+            "@sweep_range(0, 4)",
+            "@sweep_linspace(0, 1, 3)",
+        ]:
+            assert isinstance(
+                DirectiveFactory.build_consumer_from_string(directive), Sweeper
+            )
+
+        assert DirectiveFactory.build_consumer_from_string("@unknown(a)") is None
+        assert DirectiveFactory.build_consumer_from_string("not a directive") is None
+        assert DirectiveFactory.build_consumer_from_string(12) is None
+
+        # Sweeps still count as placeholders
+        assert Placeholder.from_string("@sweep(1, 2)").is_valid()
+
+    def test_parse_once(self):
+
+        a = DirectiveFactory.build_directive_from_string("@float(lr, default=0.1)")
+        b = DirectiveFactory.build_directive_from_string("@float(lr, default=0.1)")
+        assert a is b
+        assert Placeholder.from_string("@float(lr, default=0.1)").default_value == "0.1"
+
+    def test_register_consumer(self):
+
+        try:
+            DirectiveFactory.register_consumer(["banner"], Banner)
+            consumer = DirectiveFactory.build_consumer_from_string("@banner(hello)")
+            assert isinstance(consumer, Banner)
+            assert consumer.is_valid()
+            assert consumer.directive.args == ["hello"]
+
+            # Builtin labels are not overridden unless requested
+            DirectiveFactory.register_consumer(["int"], Banner, override=False)
+            assert isinstance(
+                DirectiveFactory.build_consumer_from_string("@int(a)"), Placeholder
+            )
+
+            cfg = XConfig.from_dict({"a": "@banner(hello)", "b": "@int(b)"})
+            assert cfg.a == "@banner(hello)"
+            assert len(cfg.available_placeholders()) == 1
+        finally:
+            DirectiveFactory.CONSUMERS_MAP.pop("banner")
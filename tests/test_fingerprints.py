@@ -0,0 +1,40 @@
+from pathlib import Path
+from choixe.configurations import XConfig
+from choixe.fingerprints import FingerprintIndex
+
+
+class TestFingerprints:
+    def test_fingerprint(self):
+
+        cfg = XConfig.from_dict({"a": 1, "b": {"c": [1, 2], "d": "x"}})
+        same = XConfig.from_dict({"b": {"d": "x", "c": [1, 2]}, "a": 1})
+        other = XConfig.from_dict({"a": 1, "b": {"c": [2, 1], "d": "x"}})
+
+        assert cfg.fingerprint() == same.fingerprint()
+        assert cfg.fingerprint() != other.fingerprint()
+        assert cfg.fingerprint() == cfg.copy().fingerprint()
+
+        same._filename = Path("/another/file.yml")
+        assert cfg.fingerprint() == same.fingerprint()
+
+    def test_sweep_skip(self, tmpdir):
+
+        cfg = XConfig.from_dict({"a": "@sweep(1, 2, 3)", "b": "@sweep(4, 5)"})
+        sweeped_cfgs = cfg.sweep()
+
+        filename = Path(tmpdir) / "done" / "fingerprints.txt"
+        index = FingerprintIndex(filename)
+        for sweeped_cfg in sweeped_cfgs[:4]:
+            index.add(sweeped_cfg)
+        index.add(sweeped_cfgs[0].fingerprint())
+        assert len(index) == 4
+
+        # Reload from disk, as after a crash
+        index = FingerprintIndex(filename)
+        assert len(index) == 4
+        assert sweeped_cfgs[0] in index
+
+        remaining = cfg.sweep(skip=index)
+        assert [x.to_dict() for x in remaining] == [
+            x.to_dict() for x in sweeped_cfgs[4:]
+        ]
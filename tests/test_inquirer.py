@@ -19,7 +19,10 @@ class TestInquirer(object):
         assert XInquirer.safe_cast_placeholder(True, PlaceholderType.BOOL)
         assert XInquirer.safe_cast_placeholder(0, PlaceholderType.BOOL)
         assert XInquirer.safe_cast_placeholder("hello", PlaceholderType.PATH)
-        assert XInquirer.safe_cast_placeholder("what time is it?", PlaceholderType.DATE)
+        assert XInquirer.safe_cast_placeholder("2021-03-04", PlaceholderType.DATE)
+        assert not XInquirer.safe_cast_placeholder(
+            "what time is it?", PlaceholderType.DATE
+        )
 
         d = {
             "a_int": "@int(a_int)",
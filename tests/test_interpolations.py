@@ -0,0 +1,98 @@
+import pytest
+from choixe.configurations import XConfig
+from choixe.interpolations import Interpolation
+from choixe.placeholders import PlaceholderType
+
+
+class TestInterpolations:
+    def test_scan(self):
+
+        v = "/data/@str(dataset)/@int(fold, default=0)/train"
+        interpolation = Interpolation.from_string(v)
+        assert interpolation is not None
+        assert interpolation.names == {"dataset", "fold"}
+        assert [p.type for p in interpolation.placeholders] == [
+            PlaceholderType.STR,
+            PlaceholderType.INT,
+        ]
+        assert Interpolation.from_string(v) is interpolation
+
+        assert interpolation.render({"dataset": "mnist"}) == (
+            "/data/mnist/@int(fold, default=0)/train"
+        )
+        assert interpolation.render({"dataset": "mnist", "fold": "3"}) == (
+            "/data/mnist/3/train"
+        )
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            "@str(dataset)",
+            "  @int(epochs)  ",
+            "/data/train",
+            "mail@example.com",
+            "@sweep(1, 2)/a",
+            "/data/@unknown(x)/train",
+            "/data/@str(unbalanced/train",
+            12,
+        ],
+    )
+    def test_not_interpolations(self, value):
+
+        assert Interpolation.from_string(value) is None
+
+    def test_apostrophes(self):
+
+        cfg = XConfig.from_dict(
+            {
+                "a": "@str(name, default=don't)",
+                "b": "/data/@str(dataset, default=it's)/train",
+                "c": '@sweep(["a)", 1], 2)',
+            }
+        )
+        assert set(cfg.available_placeholders().keys()) == {"a", "b[0]", "c"}
+        assert cfg.available_placeholders()["a"].default_value == "don't"
+
+        cfg.replace_variables_map({}, replace_defaults=True)
+        assert cfg.a == "don't"
+        assert cfg.b == "/data/it's/train"
+        assert [x.c for x in cfg.sweep()] == [["a)", 1], 2]
+
+    def test_replace(self):
+
+        cfg = XConfig.from_dict(
+            {
+                "train": "/data/@str(dataset)/train",
+                "val": ["/data/@str(dataset)/val_@int(fold, default=2)"],
+                "name": "@str(dataset)",
+                "prefix": "@str(dataset)/model",
+            }
+        )
+
+        placeholders = cfg.available_placeholders()
+        assert set(placeholders.keys()) == {
+            "train[0]",
+            "val.0[0]",
+            "val.0[1]",
+            "name",
+            "prefix[0]",
+        }
+        assert len(cfg.available_placeholders(ignore_defaults=True)) == 4
+
+        template = cfg.compile_template()
+        assert template.names == {"dataset", "fold"}
+
+        cfg.replace_variables_map({"dataset": "mnist"}, replace_defaults=True)
+        assert cfg.to_dict() == {
+            "train": "/data/mnist/train",
+            "val": ["/data/mnist/val_2"],
+            "name": "mnist",
+            "prefix": "mnist/model",
+        }
+        assert template.render({"dataset": "mnist"}, replace_defaults=True) == cfg
+
+    def test_environment(self, monkeypatch):
+
+        monkeypatch.setenv("CHOIXE_DATA_ROOT", "/mnt/data")
+        cfg = XConfig.from_dict({"root": "@env(CHOIXE_DATA_ROOT)/images"})
+        assert cfg.root == "/mnt/data/images"
@@ -1,6 +1,11 @@
 from choixe.importers import Importer
 from choixe.configurations import XConfig
-from choixe.placeholders import Placeholder
+from choixe.inquirer import XInquirer
+from choixe.placeholders import Placeholder, PlaceholderType
+from pathlib import Path
+import datetime
+import numpy as np
+import pytest
 
 
 class TestPlaceholders:
@@ -74,3 +79,124 @@ class TestCFGPlaceholders:
             ]
 
             assert len(new_keys) > len(old_keys)
+
+
+class TestPlaceholderCasts:
+    def test_casts(self):
+
+        assert PlaceholderType.cast("False", PlaceholderType.BOOL) is False
+        assert PlaceholderType.cast("yes", PlaceholderType.BOOL) is True
+        for value in ["t", "Y", "1", "on"]:
+            assert PlaceholderType.cast(value, PlaceholderType.BOOL) is True
+            assert XInquirer.to_bool(value) is True
+        for value in ["f", "N", "0", "off"]:
+            assert PlaceholderType.cast(value, PlaceholderType.BOOL) is False
+            assert XInquirer.to_bool(value) is False
+        assert XInquirer.to_bool("maybe") is False
+        assert XInquirer.to_bool(None) is False
+        with pytest.raises(ValueError):
+            PlaceholderType.cast("maybe", PlaceholderType.BOOL)
+
+        assert PlaceholderType.cast("a/b", PlaceholderType.PATH) == Path("a/b")
+        assert PlaceholderType.cast(
+            "2021-03-04T05:06:07", PlaceholderType.DATE
+        ) == datetime.datetime(2021, 3, 4, 5, 6, 7)
+
+        # Dates are naive UTC, whatever the input kind
+        expected = datetime.datetime(2021, 3, 4, 5, 6, 7)
+        for value in [
+            "2021-03-04T05:06:07",
+            "2021-03-04T07:06:07+02:00",
+            expected.replace(tzinfo=datetime.timezone.utc).timestamp(),
+            int(expected.replace(tzinfo=datetime.timezone.utc).timestamp()),
+        ]:
+            date = PlaceholderType.cast(value, PlaceholderType.DATE)
+            assert date.tzinfo is None
+            assert date == expected
+
+        assert PlaceholderType.cast("1, 2,3", PlaceholderType.LIST_INT) == [1, 2, 3]
+        assert PlaceholderType.cast("[0.5, 1]", PlaceholderType.LIST_FLOAT) == [
+            0.5,
+            1.0,
+        ]
+        assert PlaceholderType.cast(np.arange(2), PlaceholderType.LIST_STR) == [
+            "0",
+            "1",
+        ]
+        assert PlaceholderType.cast("true,0", PlaceholderType.LIST_BOOL) == [
+            True,
+            False,
+        ]
+
+    @pytest.mark.parametrize(
+        "tp, values",
+        [
+            (PlaceholderType.INT, ["1", 2, 3.7, True, np.int32(5)]),
+            (PlaceholderType.FLOAT, ["0.5", 2, np.float32(0.25), "1e-3"]),
+            (PlaceholderType.BOOL, ["true", "False", 0, 1]),
+            (PlaceholderType.STR, ["a", 1, 2.5]),
+            (PlaceholderType.LIST_FLOAT, ["1,2", [3, 4], np.array([5.0, 6.0])]),
+            (PlaceholderType.LIST_INT, ["1,2", "3"]),
+            (PlaceholderType.LIST_STR, ["a,b", ["c"]]),
+        ],
+    )
+    def test_cast_many(self, tp, values):
+
+        cast = PlaceholderType.cast_many(values, tp)
+        expected = [PlaceholderType.cast(v, tp) for v in values]
+        assert cast == expected
+        assert [type(x) for x in cast] == [type(x) for x in expected]
+
+        with pytest.raises(ValueError):
+            PlaceholderType.cast_many(["1", "not a number"], PlaceholderType.INT)
+
+    def test_list_placeholders(self, tmpdir):
+
+        cfg = XConfig.from_dict(
+            {
+                "mean": "@list_float(mean)",
+                "path": "@path(path)",
+                "date": "@date(date)",
+            }
+        )
+        assert len(cfg.available_placeholders()) == 3
+        cfg.replace_variables_map(
+            {"mean": "0.485,0.456,0.406", "path": "/tmp/x", "date": "2021-01-01"}
+        )
+        assert cfg.mean == [0.485, 0.456, 0.406]
+        assert cfg.path == Path("/tmp/x")
+        assert cfg.date == datetime.datetime(2021, 1, 1)
+
+        for ext in ["yml", "json"]:
+            filename = Path(tmpdir) / f"cfg.{ext}"
+            cfg.save_to(filename)
+            loaded = XConfig(filename)
+            assert loaded.mean == [0.485, 0.456, 0.406]
+            assert loaded.path == "/tmp/x"
+
+    def test_nested_native_values(self, tmpdir):
+
+        cfg = XConfig.from_dict(
+            {
+                "run": {"path": "@path(path)", "date": "@date(date)"},
+                "start": datetime.date(2021, 1, 1),
+                "stages": [{"start": datetime.date(2021, 2, 1)}],
+                "lr": "@sweep(0.1, 0.01)",
+            }
+        )
+        cfg.replace_variables_map({"path": "/tmp/x", "date": "2021-01-01"})
+
+        # Nested values keep their type like the top level ones
+        for c in [cfg, cfg.copy(), cfg.sweep()[1], cfg.sweep_set()[0]]:
+            assert c.run.path == Path("/tmp/x")
+            assert c.run.date == datetime.datetime(2021, 1, 1)
+            assert c.start == datetime.date(2021, 1, 1)
+            assert c.stages[0].start == datetime.date(2021, 2, 1)
+        assert cfg.copy().fingerprint() == cfg.fingerprint()
+
+        filename = Path(tmpdir) / "cfg.json"
+        cfg.sweep()[0].save_to(filename)
+        loaded = XConfig(filename)
+        assert loaded.run.path == "/tmp/x"
+        assert loaded.run.date == "2021-01-01T00:00:00"
+        assert loaded.stages[0].start == "2021-02-01"
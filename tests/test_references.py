@@ -0,0 +1,104 @@
+import pytest
+import yaml
+from choixe.configurations import XConfig
+from choixe.references import Reference
+
+
+class TestReferences:
+    def test_options(self):
+
+        reference = Reference.from_string("@ref(a.b.0)")
+        assert reference is not None
+        assert reference.is_valid()
+        assert reference.path == "a.b.0"
+        assert reference.keys == ["a", "b", "0"]
+        assert Reference.generate_reference_directive("a.b") == "@ref(a.b)"
+
+        assert not Reference.from_string("@import(a.yml)").is_valid()
+
+    def test_resolution(self):
+
+        cfg = XConfig.from_dict(
+            {
+                "stats": {"mean": [1, 2, 3], "std": {"r": 1, "g": 2}},
+                "train": {"norm": "@ref(stats)"},
+                "val": {"norm": "@ref(train.norm)", "g": "@ref(stats.std.g)"},
+                "sets": ["@ref(stats.mean)", "@ref(sets.0)"],
+            }
+        )
+
+        assert cfg.train.norm == cfg.stats
+        assert cfg.val.norm == cfg.stats
+        assert cfg.val.g == 2
+        assert cfg.sets == [[1, 2, 3], [1, 2, 3]]
+        assert cfg.to_dict()["val"]["norm"] == {
+            "mean": [1, 2, 3],
+            "std": {"r": 1, "g": 2},
+        }
+
+    def test_independent_copies(self):
+
+        cfg = XConfig.from_dict(
+            {
+                "stats": {"mean": [1, 2, 3], "std": 1},
+                "a": "@ref(stats)",
+                "b": "@ref(stats)",
+                "c": ["@ref(stats.mean)"],
+            }
+        )
+
+        cfg.a.std = 100
+        cfg["b"]["mean"].append(9)
+        cfg.c[0][0] = 10
+        cfg.deep_set("b.std", 5)
+
+        assert cfg.stats == {"mean": [1, 2, 3], "std": 1}
+        assert cfg.a == {"mean": [1, 2, 3], "std": 100}
+        assert cfg.b == {"mean": [1, 2, 3, 9], "std": 5}
+        assert cfg.c == [[10, 2, 3]]
+        assert cfg.copy().stats == {"mean": [1, 2, 3], "std": 1}
+
+        cfg.stats.mean.append(4)
+        assert cfg.a.mean == [1, 2, 3]
+
+    def test_placeholders_in_references(self):
+
+        cfg = XConfig.from_dict({"a": {"x": "@int(x)"}, "b": "@ref(a)"})
+        assert len(cfg.available_placeholders()) == 2
+        cfg.replace_variables_map({"x": "3"})
+        assert cfg.a.x == 3
+        assert cfg.b.x == 3
+
+    def test_references_to_imports(self, tmpdir):
+
+        with open(tmpdir / "stats.yml", "w") as f:
+            yaml.safe_dump({"mean": 0.5, "std": 0.2}, f)
+        with open(tmpdir / "cfg.yml", "w") as f:
+            yaml.safe_dump(
+                {"stats": "@import(stats.yml)", "norm": {"std": "@ref(stats.std)"}}, f
+            )
+
+        cfg = XConfig(filename=tmpdir / "cfg.yml")
+        assert cfg.norm.std == 0.2
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            {"a": "@ref(b)", "b": "@ref(a)"},
+            {"a": "@ref(b)", "b": "@ref(c)", "c": {"d": "@ref(a)"}},
+            {"a": {"b": "@ref(a)"}},
+            {"a": ["@ref(a.1)", "@ref(a.0)"]},
+        ],
+    )
+    def test_cycles(self, data):
+
+        with pytest.raises(ValueError):
+            XConfig.from_dict(data)
+
+    def test_missing(self):
+
+        with pytest.raises(KeyError):
+            XConfig.from_dict({"a": "@ref(b.c)", "b": {}})
+
+        cfg = XConfig.from_dict({"a": "@ref(b)"}, no_deep_parse=True)
+        assert cfg.a == "@ref(b)"
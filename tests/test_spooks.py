@@ -1,7 +1,9 @@
+import dataclasses
 import rich
+import yaml
 import pytest
 from schema import Or, SchemaError
-from choixe.spooks import MetaSpook, Spook
+from choixe.spooks import MetaSpook, Spook, SpookProxy, fast_spook
 from pathlib import Path
 
 
@@ -202,3 +204,644 @@ class TestSpookNestedSerializationToFile(object):
             else:
                 with pytest.raises(SchemaError):
                     nested_0.serialize(validate=True)
+
+
+class TestSpookSchemaCache(object):
+    def test_cached_schema(self):
+
+        schema = CustomUserObject__.full_spook_schema()
+        assert schema is CustomUserObject__.full_spook_schema()
+        assert SimpleUserObject__.full_spook_schema() is not schema
+
+        original = CustomUserObject__.__dict__["spook_schema"]
+        try:
+            CustomUserObject__.spook_schema = classmethod(lambda cls: {"a": int})
+            assert CustomUserObject__.full_spook_schema() is not schema
+            with pytest.raises(SchemaError):
+                CustomUserObject__(a=1, b="b", c=True).serialize()
+        finally:
+            CustomUserObject__.spook_schema = original
+        CustomUserObject__(a=1, b="b", c=True).serialize()
+
+    def test_forward_reference(self):
+
+        # The schema refers to a class defined later, it must not be compiled yet
+        class ForwardUserObject__(Spook):
+            def __init__(self, o: Spook):
+                self.o = o
+
+            @classmethod
+            def spook_schema(cls) -> dict:
+                return {"o": LaterUserObject__.full_spook_schema()}
+
+            @classmethod
+            def from_dict(cls, d: dict):
+                return cls(o=Spook.create(d["o"]))
+
+            def to_dict(self) -> dict:
+                return {"o": self.o.serialize()}
+
+        class LaterUserObject__(Spook):
+            def __init__(self, a: int):
+                self.a = a
+
+            @classmethod
+            def spook_schema(cls) -> dict:
+                return {"a": int}
+
+        serialized = ForwardUserObject__(LaterUserObject__(1)).serialize()
+        assert Spook.create(serialized).o.a == 1
+        with pytest.raises(SchemaError):
+            ForwardUserObject__(LaterUserObject__("1")).serialize()
+
+    def test_trusted(self):
+
+        invalid = {
+            Spook.TYPE_FIELD: CustomUserObject__.spook_name(),
+            Spook.ARGS_FIELD: {"a": "error!", "b": "hello", "c": True},
+        }
+        with pytest.raises(SchemaError):
+            Spook.create(invalid)
+
+        with Spook.trusted():
+            o = Spook.create(invalid)
+            assert o.to_dict()["a"] == "error!"
+            o.serialize()
+        assert not Spook.TRUSTED
+
+        try:
+            Spook.set_trusted()
+            Spook.create(invalid)
+        finally:
+            Spook.set_trusted(False)
+
+
+class TestSpookCreateMany(object):
+    @pytest.mark.parametrize("workers", [0, 2])
+    def test_create_many(self, workers):
+
+        objs = []
+        for i in range(50):
+            objs.append(SimpleUserObject__(a=i, b=str(i), c=i % 2 == 0))
+            objs.append(CustomUserObject__(a=i, b=None, c=True))
+            objs.append(
+                NestedUserObject_(
+                    name=str(i),
+                    o0=CustomUserObject__(a=i),
+                    o1=CustomUserObject__(b=str(i)),
+                )
+            )
+        dicts = [o.serialize() for o in objs]
+
+        created = Spook.create_many(dicts, workers=workers, batch_size=16)
+        assert len(created) == len(objs)
+        for o, c in zip(objs, created):
+            assert type(o) is type(c)
+            assert o == c
+
+        assert Spook.create_many([]) == []
+
+    def test_create_many_errors(self):
+
+        invalid = CustomUserObject__(a=1).serialize()
+        invalid[Spook.ARGS_FIELD]["a"] = "error!"
+        with pytest.raises(SchemaError):
+            Spook.create_many([CustomUserObject__(a=1).serialize(), invalid])
+        assert len(Spook.create_many([invalid], validate=False)) == 1
+
+        with pytest.raises(RuntimeError):
+            Spook.create_many([{Spook.TYPE_FIELD: "not.a.Spook", Spook.ARGS_FIELD: {}}])
+
+
+class PipelineNode__(Spook):
+    def __init__(self, name: str, tokenizer: CustomUserObject__, children: list = None):
+        self.name = name
+        self.tokenizer = tokenizer
+        self.children = children or []
+
+
+class TestSpookRecursiveSerialization(object):
+    def test_recursive(self, tmpdir):
+
+        tokenizer = CustomUserObject__(a=1, b="bpe", c=True)
+        root = PipelineNode__(
+            name="root",
+            tokenizer=tokenizer,
+            children=[
+                PipelineNode__(name="a", tokenizer=tokenizer),
+                PipelineNode__(name="b", tokenizer=CustomUserObject__(a=1, b="bpe")),
+            ],
+        )
+
+        rep = root.serialize(recursive=True)
+        children = rep[Spook.ARGS_FIELD]["children"]
+        assert children[0][Spook.TYPE_FIELD] == PipelineNode__.spook_name()
+        assert rep[Spook.ARGS_FIELD]["tokenizer"] is children[0]["args"]["tokenizer"]
+
+        hydrated = Spook.create(rep, recursive=True)
+        assert isinstance(hydrated, PipelineNode__)
+        a, b = hydrated.children
+        assert isinstance(a, PipelineNode__) and isinstance(b, PipelineNode__)
+        assert hydrated.tokenizer == tokenizer
+        assert a.tokenizer is hydrated.tokenizer
+        assert b.tokenizer is not hydrated.tokenizer
+
+        # Identical specs are shared even if they are different dicts
+        rep = {
+            Spook.TYPE_FIELD: PipelineNode__.spook_name(),
+            Spook.ARGS_FIELD: {
+                "name": "root",
+                "tokenizer": CustomUserObject__(a=1).serialize(),
+                "children": [
+                    PipelineNode__(
+                        name="a", tokenizer=CustomUserObject__(a=1)
+                    ).serialize(recursive=True),
+                ],
+            },
+        }
+        hydrated = Spook.create(rep, recursive=True)
+        assert hydrated.children[0].tokenizer is hydrated.tokenizer
+
+        # Classes hydrating their nested spooks manually are still supported
+        nested = NestedUserObject_(
+            name="n", o0=CustomUserObject__(a=1), o1=CustomUserObject__(a=1)
+        )
+        hydrated = Spook.create(nested.serialize(), recursive=True)
+        assert hydrated == nested
+        assert hydrated._o0 is hydrated._o1
+
+        invalid = root.serialize(recursive=True)
+        invalid[Spook.ARGS_FIELD]["tokenizer"][Spook.ARGS_FIELD]["a"] = "error!"
+        with pytest.raises(SchemaError):
+            Spook.create(invalid, recursive=True)
+
+    def test_recursive_from_file(self, tmpdir):
+
+        tokenizer = CustomUserObject__(a=1, b="bpe", c=True)
+        serialized = PipelineNode__(name="root", tokenizer=tokenizer).serialize(
+            recursive=True
+        )
+        cfg_file = Path(tmpdir) / "cfg.yml"
+        with open(cfg_file, "w") as f:
+            yaml.safe_dump(
+                {
+                    Spook.TYPE_FIELD: PipelineNode__.spook_name(),
+                    Spook.ARGS_FIELD: {
+                        "name": "top",
+                        "tokenizer": serialized[Spook.ARGS_FIELD]["tokenizer"],
+                        "children": [serialized, "@ref(args.children.0)"],
+                    },
+                },
+                f,
+            )
+
+        hydrated = Spook.create_from_file(str(cfg_file), recursive=True)
+        assert hydrated.children[0] is hydrated.children[1]
+        assert hydrated.children[0].tokenizer is hydrated.tokenizer
+
+
+class HeavyUserObject__(Spook):
+    BUILT = 0
+
+    def __init__(self, size: int) -> None:
+        HeavyUserObject__.BUILT += 1
+        self.size = size
+
+    def __call__(self, x: int) -> int:
+        return x * self.size
+
+    def __len__(self) -> int:
+        return self.size
+
+
+class TestSpookLazy(object):
+    def test_lazy(self):
+
+        d = HeavyUserObject__(size=3).serialize()
+        built = HeavyUserObject__.BUILT
+
+        proxy = Spook.create(d, lazy=True)
+        assert not proxy.materialized
+        assert proxy.spook_name == HeavyUserObject__.spook_name()
+        assert "SpookProxy" in repr(proxy)
+        assert HeavyUserObject__.BUILT == built
+
+        assert proxy.size == 3
+        assert proxy.materialized
+        assert HeavyUserObject__.BUILT == built + 1
+        assert proxy(2) == 6
+        assert len(proxy) == 3
+        assert isinstance(proxy, HeavyUserObject__)
+        assert proxy.materialize() is proxy.materialize()
+        assert HeavyUserObject__.BUILT == built + 1
+
+        proxy.size = 4
+        assert proxy.materialize().size == 4
+
+        other = Spook.create(
+            SimpleUserObject__(a=1, b="b", c=True).serialize(), lazy=True
+        )
+        assert other == SimpleUserObject__(a=1, b="b", c=True)
+
+    def test_lazy_errors(self):
+
+        proxy = Spook.create(
+            {Spook.TYPE_FIELD: "not.a.Spook", Spook.ARGS_FIELD: {}}, lazy=True
+        )
+        with pytest.raises(RuntimeError):
+            proxy.materialize()
+
+    def test_lazy_copy_and_pickle(self):
+        import copy
+        import pickle
+
+        o = SimpleUserObject__(a=1, b="b", c=True)
+        proxy = Spook.create(o.serialize(), lazy=True)
+
+        for clone in [copy.deepcopy(proxy), pickle.loads(pickle.dumps(proxy))]:
+            assert not proxy.materialized
+            assert type(clone) is SpookProxy
+            assert not clone.materialized
+            assert clone == o
+
+        proxy.materialize()
+        for clone in [copy.deepcopy(proxy), pickle.loads(pickle.dumps(proxy))]:
+            assert type(clone) is SimpleUserObject__
+            assert clone == o
+            assert clone is not proxy.materialize()
+
+    def test_materialize_many(self):
+
+        dicts = [HeavyUserObject__(size=i).serialize() for i in range(20)]
+        built = HeavyUserObject__.BUILT
+        proxies = [Spook.create(d, lazy=True) for d in dicts] + ["not a proxy"]
+        assert HeavyUserObject__.BUILT == built
+
+        objs = SpookProxy.materialize_many(proxies, workers=4)
+        assert HeavyUserObject__.BUILT == built + 20
+        assert [o.size for o in objs[:-1]] == list(range(20))
+        assert objs[-1] == "not a proxy"
+        assert all(p.materialized for p in proxies[:-1])
+
+
+class TestSpookDynamicImport(object):
+    def test_dynamic_import(self):
+
+        Spook.clear_import_cache()
+        from email.mime.text import MIMEText
+        import xml.dom
+
+        assert Spook.dynamic_import("email.mime.text.MIMEText") is MIMEText
+        assert Spook.dynamic_import("xml.dom") is xml.dom
+        assert Spook.dynamic_import("xml.dom.minidom.parseString") is not None
+        assert (
+            Spook.dynamic_import(CustomUserObject__.spook_name()) is CustomUserObject__
+        )
+
+        for name in ["not_a_module.Class", "email.mime.text.NotAClass", ""]:
+            with pytest.raises(ImportError):
+                Spook.dynamic_import(name)
+
+    def test_negative_cache(self, monkeypatch):
+
+        Spook.clear_import_cache()
+        calls = []
+        import_name = Spook._import_name.__func__
+
+        def _import_name(cls, name):
+            calls.append(name)
+            return import_name(cls, name)
+
+        monkeypatch.setattr(Spook, "_import_name", classmethod(_import_name))
+
+        for _ in range(5):
+            with pytest.raises(RuntimeError):
+                Spook.create({Spook.TYPE_FIELD: "not_a_module.A", Spook.ARGS_FIELD: {}})
+        assert calls == ["not_a_module.A"]
+
+        monkeypatch.setattr(Spook, "IMPORT_FAILURE_TTL", 0.0)
+        with pytest.raises(ImportError):
+            Spook.dynamic_import("not_a_module.A")
+        assert len(calls) == 2
+
+        for _ in range(3):
+            Spook.dynamic_import("email.mime.text.MIMEText")
+        assert calls.count("email.mime.text.MIMEText") == 1
+        Spook.clear_import_cache()
+
+
+PLUGIN_CODE = """
+from choixe.spooks import Spook
+
+
+class Resize(Spook):
+    def __init__(self, size: int):
+        self.size = size
+
+    @classmethod
+    def spook_name(cls) -> str:
+        return "{package}.Resize"
+"""
+
+
+@pytest.fixture(scope="function")
+def spook_plugin(tmpdir, monkeypatch):
+    """Package defining a Spook with a short name, not importable from the name"""
+
+    import sys
+
+    package = f"plugin_{Path(tmpdir).name}".replace("-", "_")
+    folder = Path(tmpdir) / package / "ops"
+    folder.mkdir(parents=True)
+    (folder.parent / "__init__.py").write_text("")
+    (folder / "__init__.py").write_text("")
+    (folder / "resize.py").write_text(PLUGIN_CODE.format(package=package))
+    monkeypatch.syspath_prepend(str(tmpdir))
+    monkeypatch.setattr(MetaSpook, "SPOOKS_INDEX", {})
+    monkeypatch.setattr(MetaSpook, "_INDEX_LOADED", False)
+
+    def _unload():
+        for name in list(sys.modules):
+            if name.startswith(package):
+                sys.modules.pop(name)
+        for name in list(MetaSpook.SPOOKS_MAP):
+            if name.startswith(package):
+                MetaSpook.SPOOKS_MAP.pop(name)
+        Spook.clear_import_cache()
+
+    yield package, f"{package}.ops.resize", _unload
+    _unload()
+
+
+class TestSpookIndex(object):
+    def test_index_file(self, tmpdir, spook_plugin, monkeypatch):
+
+        import json
+        import sys
+
+        package, module, unload = spook_plugin
+        name = f"{package}.Resize"
+        serialized = {Spook.TYPE_FIELD: name, Spook.ARGS_FIELD: {"size": 3}}
+
+        with pytest.raises(RuntimeError):
+            Spook.create(serialized)
+
+        index = MetaSpook.build_index([package])
+        assert index == {name: module}
+        assert MetaSpook.build_index([module], recursive=False) == index
+        unload()
+
+        index_file = Path(tmpdir) / "index.json"
+        index_file.write_text(json.dumps(index))
+        monkeypatch.setenv(MetaSpook.INDEX_ENV_VARIABLE, str(index_file))
+        monkeypatch.setattr(MetaSpook, "_INDEX_LOADED", False)
+        assert module not in sys.modules
+
+        obj = Spook.create(serialized)
+        assert obj.size == 3
+        assert module in sys.modules
+        assert Spook.create(serialized).size == 3
+
+    def test_entry_points(self, spook_plugin, monkeypatch):
+
+        import sys
+        from types import SimpleNamespace
+        import choixe.spooks
+
+        package, module, _ = spook_plugin
+        name = f"{package}.Resize"
+        entry_point = SimpleNamespace(name=name, value=f"{module}:Resize")
+
+        def _entry_points(group):
+            return [entry_point] if group == MetaSpook.ENTRY_POINTS_GROUP else []
+
+        monkeypatch.setattr(choixe.spooks, "_entry_points", _entry_points)
+        assert module not in sys.modules
+        obj = Spook.create({Spook.TYPE_FIELD: name, Spook.ARGS_FIELD: {"size": 5}})
+        assert obj.size == 5
+        assert MetaSpook.indexed_module(name) == module
+
+
+class TestSpookStreams(object):
+    @pytest.mark.parametrize("extension", ["jsonl", "msgpack"])
+    def test_dump_load_many(self, tmpdir, extension):
+
+        if extension == "msgpack":
+            pytest.importorskip("msgpack")
+
+        objs = []
+        for i in range(100):
+            objs.append(SimpleUserObject__(a=i, b=str(i), c=i % 2 == 0))
+            objs.append(CustomUserObject__(a=i, b=None, c=True))
+        filename = Path(tmpdir) / f"spooks.{extension}"
+
+        assert Spook.dump_many(iter(objs), filename) == len(objs)
+        loaded = Spook.load_many(filename)
+        assert not isinstance(loaded, list)
+        loaded = list(loaded)
+        assert len(loaded) == len(objs)
+        for o, c in zip(objs, loaded):
+            assert type(o) is type(c)
+            assert o == c
+
+        proxies = list(Spook.load_many(filename, lazy=True))
+        assert isinstance(proxies[0], SpookProxy)
+        assert proxies[0] == objs[0]
+
+        # Nested spooks
+        tokenizer = CustomUserObject__(a=1, b="bpe", c=True)
+        nodes = [PipelineNode__(name=str(i), tokenizer=tokenizer) for i in range(3)]
+        Spook.dump_many(nodes, filename, recursive=True)
+        loaded = list(Spook.load_many(filename, recursive=True))
+        assert [n.name for n in loaded] == ["0", "1", "2"]
+        assert all(n.tokenizer == tokenizer for n in loaded)
+
+        with open(filename, "rb") as f:
+            data = f.read()
+        with open(filename, "wb") as f:
+            f.write(data[:-3])
+        with pytest.raises(Exception):
+            list(Spook.load_many(filename))
+
+    def test_formats(self, tmpdir):
+
+        with pytest.raises(NotImplementedError):
+            Spook.dump_many([], Path(tmpdir) / "spooks.jsonl", fmt="csv")
+
+        o = CustomUserObject__(a=1, b="b", c=True)
+        for ext in ["json", "yml", "toml"]:
+            filename = Path(tmpdir) / f"spook.{ext}"
+            o.serialize_to_file(str(filename))
+            assert Spook.create_from_file(str(filename)) == o
+
+
+@fast_spook
+@dataclasses.dataclass
+class FastDataUserObject__(Spook):
+    a: int
+    b: str = "b"
+    c: bool = False
+    tags: list = dataclasses.field(default_factory=list)
+    cached: int = dataclasses.field(default=0, init=False, compare=False)
+
+
+@fast_spook
+class FastSlotsUserObject__(Spook):
+    __slots__ = ("a", "_b")
+
+    def __init__(self, a: float, b: Path = None):
+        self.a = a
+        self._b = b
+
+    def __eq__(self, o: object) -> bool:
+        return self.a == o.a and self._b == o._b
+
+
+@fast_spook
+class FastPlainUserObject__(Spook):
+    def __init__(self, a, b: str, c: bool = True) -> None:
+        self._a = a
+        self.b = b
+        self.c = c
+        self._private = "not serialized"
+
+    @classmethod
+    def spook_schema(cls) -> dict:
+        return {"a": int, "b": str, "c": bool}
+
+
+class TestFastSpook(object):
+    def test_dataclass(self):
+
+        o = FastDataUserObject__(a=1, b="x", c=True, tags=["t"])
+        o.cached = 5
+        rep = o.serialize()
+        assert rep[Spook.ARGS_FIELD] == {"a": 1, "b": "x", "c": True, "tags": ["t"]}
+        assert Spook.create(rep) == o
+
+        c = FastDataUserObject__.from_dict({"a": "3", "c": "false"})
+        assert c == FastDataUserObject__(a=3, b="b", c=False)
+        assert FastDataUserObject__.from_dict({"a": 1}).tags is not c.tags
+
+        # Casts to int do not truncate
+        assert FastDataUserObject__.from_dict({"a": 3.0}).a == 3
+        assert type(FastDataUserObject__.from_dict({"a": 3.0}).a) is int
+        for value in [2.9, "2.9", float("nan")]:
+            with pytest.raises(ValueError):
+                FastDataUserObject__.from_dict({"a": value})
+
+    def test_slots(self):
+
+        o = FastSlotsUserObject__(a=1.5, b=Path("/tmp/x"))
+        assert not hasattr(o, "__dict__")
+        assert o.to_dict() == {"a": 1.5, "b": Path("/tmp/x")}
+
+        c = FastSlotsUserObject__.from_dict({"a": "1.5", "b": "/tmp/x"})
+        assert c == o
+        assert FastSlotsUserObject__.from_dict({"a": 2})._b is None
+
+    def test_plain(self):
+
+        o = FastPlainUserObject__(a=1, b="x")
+        assert o.to_dict() == {"a": 1, "b": "x", "c": True}
+        assert o.to_dict() == {"a": 1, "b": "x", "c": True}
+
+        c = Spook.create(
+            {
+                Spook.TYPE_FIELD: FastPlainUserObject__.spook_name(),
+                Spook.ARGS_FIELD: {"a": "7", "b": "y", "c": False},
+            },
+            validate=False,
+        )
+        assert c.to_dict() == {"a": 7, "b": "y", "c": False}
+
+    def test_errors(self):
+
+        class Variadic(Spook):
+            def __init__(self, **kwargs):
+                pass
+
+        with pytest.raises(TypeError):
+            fast_spook(Variadic)
+
+        with pytest.raises(TypeError):
+            fast_spook(dict)
+
+        @fast_spook
+        class Custom(Spook):
+            def __init__(self, a: int):
+                self.a = a
+
+            def to_dict(self) -> dict:
+                return {"a": self.a, "custom": True}
+
+        assert Custom(a=1).to_dict() == {"a": 1, "custom": True}
+        assert Custom.from_dict({"a": "2"}).a == 2
+
+
+@dataclasses.dataclass(frozen=True)
+class CachedUserObject__(Spook):
+    cacheable = True
+
+    name: str
+    size: int = 1
+
+    @classmethod
+    def spook_schema(cls) -> dict:
+        return {"name": str, "size": int}
+
+
+class TestSpookInstancesCache(object):
+    def setup_method(self):
+        Spook.INSTANCES_CACHE.clear()
+
+    def test_shared_instances(self):
+
+        d = CachedUserObject__("a", 2).serialize()
+        a = Spook.create(d)
+        b = Spook.create(
+            {"args": {"size": 2, "name": "a"}, Spook.TYPE_FIELD: d[Spook.TYPE_FIELD]}
+        )
+        c = Spook.create(CachedUserObject__("b", 2).serialize())
+        assert a is b
+        assert a is not c
+        assert a == CachedUserObject__("a", 2)
+
+        info = Spook.INSTANCES_CACHE.info()
+        assert (info.hits, info.misses, info.currsize) == (1, 2, 2)
+
+        # Not cacheable spooks are always hydrated from scratch
+        d = CustomUserObject__(2, "b", True).serialize()
+        assert Spook.create(d) is not Spook.create(d)
+        assert Spook.INSTANCES_CACHE.info().currsize == 2
+
+    def test_recursive_and_batch(self):
+
+        d = CachedUserObject__("a").serialize()
+        tree = {"x": d, "y": [dict(d)]}
+        created = Spook.create(tree, recursive=True)
+        assert created["x"] is created["y"][0]
+        assert Spook.create_many([d, d])[0] is created["x"]
+
+    def test_bounded(self):
+
+        Spook.INSTANCES_CACHE.resize(2)
+        try:
+            first = Spook.create(CachedUserObject__("a").serialize())
+            for name in ["b", "c"]:
+                Spook.create(CachedUserObject__(name).serialize())
+            assert Spook.INSTANCES_CACHE.info().currsize == 2
+            assert Spook.create(CachedUserObject__("a").serialize()) is not first
+        finally:
+            Spook.INSTANCES_CACHE.resize(4096)
+
+    def test_validation(self):
+
+        d = CachedUserObject__("a").serialize()
+        d["args"]["size"] = "1"
+        obj = Spook.create(d, validate=False)
+
+        # Entries hydrated without validation are validated when requested
+        assert Spook.create(d, validate=False) is obj
+        with pytest.raises(SchemaError):
+            Spook.create(d)
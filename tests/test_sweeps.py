@@ -1,4 +1,8 @@
-from choixe.configurations import XConfig
+import os
+import pytest
+from choixe.configurations import SweepSet, XConfig, _load_sweep_import
+from pathlib import Path
+from choixe.sweepers import SweepConstraint, Sweeper
 
 
 class TestSweeps:
@@ -39,3 +43,370 @@ class TestSweeps:
         }
         cfg = XConfig.from_dict(root_cfg)
         assert len(cfg.sweep()) == 1
+
+    def test_sweep_at(self):
+
+        root_cfg = {
+            "a": self._build_sweep([1, 2, 3]),
+            "b": {"c": self._build_sweep(['"x"', '"y"']), "d": 5},
+            "e": [self._build_sweep([True, False]), 0],
+        }
+
+        cfg = XConfig.from_dict(root_cfg)
+        sweeped_cfgs = cfg.sweep()
+        assert cfg.sweep_length() == len(sweeped_cfgs) == 12
+
+        for idx, sweeped_cfg in enumerate(sweeped_cfgs):
+            assert cfg.sweep_at(idx).to_dict() == sweeped_cfg.to_dict()
+        assert cfg.sweep_at(-1).to_dict() == sweeped_cfgs[-1].to_dict()
+
+        with pytest.raises(IndexError):
+            cfg.sweep_at(12)
+
+    def test_sweep_shards(self):
+
+        root_cfg = {
+            "a": self._build_sweep([1, 2, 3]),
+            "b": self._build_sweep([4, 5, 6, 7]),
+        }
+
+        cfg = XConfig.from_dict(root_cfg)
+        expected = [x.to_dict() for x in cfg.sweep()]
+
+        num_shards = 5
+        shards = [
+            [x.to_dict() for x in cfg.iter_sweep(shard=k, num_shards=num_shards)]
+            for k in range(num_shards)
+        ]
+        assert sum(len(x) for x in shards) == len(expected)
+        for k, shard in enumerate(shards):
+            assert shard == expected[k::num_shards]
+
+        with pytest.raises(ValueError):
+            list(cfg.iter_sweep(shard=5, num_shards=5))
+
+    def test_sweep_literals(self):
+
+        root_cfg = {
+            "a": '@sweep(None, "hello world", [1, 2], (3, 4), -1.5e-3)',
+            "b": "@sweep(1)",
+        }
+
+        cfg = XConfig.from_dict(root_cfg)
+        values = [x.a for x in cfg.sweep()]
+        assert values == [None, "hello world", [1, 2], (3, 4), -1.5e-3]
+
+    def test_sweep_literals_not_shared(self):
+
+        sweep = '@sweep([1, 2], {"k": 1})'
+        Sweeper.from_string(sweep).values[0].append(7)
+        Sweeper.from_string(sweep).values[1]["k"] = 2
+        assert Sweeper.from_string(sweep).values == ([1, 2], {"k": 1})
+
+        cfg = XConfig.from_dict({"a": sweep})
+        cfg.sweep()[0].a.append(7)
+        assert [x.a for x in cfg.sweep()] == [[1, 2], {"k": 1}]
+
+    def test_sweep_not_literals(self):
+
+        for value in [
+            '@sweep(1, __import__("os").getcwd())',
+            "@sweep(1, undefined_name)",
+            "@sweep(1, 2 +)",
+        ]:
+            cfg = XConfig.from_dict({"a": value})
+            with pytest.raises(ValueError):
+                cfg.sweep()
+
+    @pytest.mark.parametrize("method", ["random", "lhs", "sobol"])
+    def test_sample_sweep(self, method):
+
+        values = list(range(10))
+        root_cfg = {f"p{i}": self._build_sweep(values) for i in range(20)}
+        root_cfg["constant"] = "hello"
+
+        cfg = XConfig.from_dict(root_cfg)
+        assert cfg.sweep_length() == 10**20
+
+        samples = cfg.sample_sweep(16, method=method, seed=42)
+        assert len(samples) == 16
+        for sample in samples:
+            assert sample.constant == "hello"
+            assert all(sample[f"p{i}"] in values for i in range(20))
+
+        again = cfg.sample_sweep(16, method=method, seed=42)
+        assert [x.to_dict() for x in samples] == [x.to_dict() for x in again]
+
+        shards = [
+            cfg.sample_sweep(16, method=method, seed=42, shard=k, num_shards=3)
+            for k in range(3)
+        ]
+        for k, shard in enumerate(shards):
+            assert [x.to_dict() for x in shard] == [x.to_dict() for x in samples[k::3]]
+
+    def test_sample_sweep_lhs_strata(self):
+
+        cfg = XConfig.from_dict(
+            {"a": self._build_sweep(range(8)), "b": self._build_sweep(range(8))}
+        )
+        samples = cfg.sample_sweep(8, method="lhs", seed=0)
+        assert sorted(x.a for x in samples) == list(range(8))
+        assert sorted(x.b for x in samples) == list(range(8))
+
+        samples = cfg.sample_sweep(8, method="sobol")
+        assert sorted(x.a for x in samples) == list(range(8))
+        assert sorted(x.b for x in samples) == list(range(8))
+
+    def test_sample_sweep_edge_cases(self):
+
+        cfg = XConfig.from_dict({"a": 1})
+        for method in ["random", "lhs", "sobol"]:
+            samples = cfg.sample_sweep(4, method=method, seed=0)
+            assert [x.to_dict() for x in samples] == [{"a": 1}]
+
+        cfg = XConfig.from_dict({f"p{i}": "@sweep(1, 2)" for i in range(30)})
+        with pytest.raises(ValueError):
+            cfg.sample_sweep(4, method="sobol")
+        assert len(cfg.sample_sweep(4, method="lhs")) == 4
+
+    def test_sample_sweep_plain_values(self):
+
+        cfg = XConfig.from_dict(
+            {"lr": "@sweep_logspace(-3, -1, 3)", "n": "@sweep_range(0, 4)"}
+        )
+        for sample in cfg.sample_sweep(4, seed=0):
+            assert type(sample.lr) is float
+            assert type(sample.n) is int
+
+    def test_sweep_ranges(self):
+
+        root_cfg = {
+            "ints": "@sweep_range(0, 10, 3)",
+            "floats": "@sweep_range(0.0, 1.0, 0.25)",
+            "lin": "@sweep_linspace(0, 1, 5)",
+            "log": "@sweep_logspace(-4, -1, 50)",
+        }
+
+        cfg = XConfig.from_dict(root_cfg)
+        assert len(cfg.available_placeholders()) == 4
+        assert cfg.sweep_length() == 4 * 4 * 5 * 50
+
+        last = cfg.sweep_at(-1)
+        assert last.ints == 9
+        assert last.floats == 0.75
+        assert last.lin == 1.0
+        assert last.log == pytest.approx(0.1)
+
+        first = cfg.sweep_at(0)
+        assert first.log == pytest.approx(1e-4)
+
+        sweeped = cfg.sweep()
+        assert len(sweeped) == cfg.sweep_length()
+        assert sorted(set(x.lin for x in sweeped)) == [0.0, 0.25, 0.5, 0.75, 1.0]
+
+    def test_sweep_ranges_wrong(self):
+
+        for value in [
+            "@sweep_range(0, 1, 0)",
+            "@sweep_linspace(0, 1)",
+            "@sweep_logspace(0, 1, 2.5)",
+        ]:
+            cfg = XConfig.from_dict({"a": value})
+            with pytest.raises(ValueError):
+                cfg.sweep()
+
+    def test_sweep_groups(self):
+
+        root_cfg = {
+            "batch_size": "@sweep(16, 32, 64, group=bs)",
+            "lr": "@sweep(0.1, 0.2, 0.4, group=bs)",
+            "image": {
+                "size": '@sweep(128, 256, group="img")',
+                "crop": "@sweep(112, 224, group=img)",
+            },
+            "seed": "@sweep(0, 1)",
+        }
+
+        cfg = XConfig.from_dict(root_cfg)
+        assert len(cfg.sweep_axes()) == 3
+        assert cfg.sweep_length() == 3 * 2 * 2
+
+        sweeped_cfgs = cfg.sweep()
+        assert len(sweeped_cfgs) == 12
+        pairs = set()
+        for idx, sweeped_cfg in enumerate(sweeped_cfgs):
+            assert sweeped_cfg.lr == sweeped_cfg.batch_size / 160
+            assert sweeped_cfg.image.crop * 8 == sweeped_cfg.image.size * 7
+            assert cfg.sweep_at(idx).to_dict() == sweeped_cfg.to_dict()
+            pairs.add((sweeped_cfg.batch_size, sweeped_cfg.image.size))
+        assert len(pairs) == 6
+
+        for sample in cfg.sample_sweep(8, method="lhs", seed=1):
+            assert sample.lr == sample.batch_size / 160
+
+    def test_sweep_groups_wrong(self):
+
+        root_cfg = {
+            "a": "@sweep(1, 2, 3, group=g)",
+            "b": "@sweep_range(0, 2, group=g)",
+        }
+        cfg = XConfig.from_dict(root_cfg)
+        with pytest.raises(ValueError):
+            cfg.sweep()
+
+    def test_sweep_constraints(self):
+
+        root_cfg = {
+            "model": {
+                "hidden_dim": "@sweep(64, 96, 128, 256)",
+                "num_heads": "@sweep(2, 3, 4, 6, 8)",
+                "layers": ["@sweep(1, 2, 3)", 10],
+            },
+            "max_heads": 6,
+        }
+        cfg = XConfig.from_dict(root_cfg)
+
+        def _valid(c):
+            m = c.model
+            return (
+                m.hidden_dim % m.num_heads == 0
+                and m.num_heads <= 6
+                and m.layers[0] < m.layers[1] // 4
+            )
+
+        expected = [x.to_dict() for x in cfg.sweep() if _valid(x)]
+        assert 0 < len(expected) < cfg.sweep_length()
+
+        constraints = [
+            "model.hidden_dim % model.num_heads == 0",
+            "model.num_heads <= max_heads",
+            "model.layers[0] < model.layers[1] // 4",
+        ]
+        assert [x.to_dict() for x in cfg.sweep(constraints=constraints)] == expected
+
+        shards = [
+            [x.to_dict() for x in cfg.iter_sweep(k, 2, constraints=constraints)]
+            for k in range(2)
+        ]
+        assert shards[0] == expected[0::2] and shards[1] == expected[1::2]
+
+        constraints = [
+            SweepConstraint(
+                lambda h, n: h % n == 0, ["model.hidden_dim", "model.num_heads"]
+            ),
+            lambda values: values["model.num_heads"] <= 6,
+            "model.layers[0] < 2",
+        ]
+        assert [x.to_dict() for x in cfg.sweep(constraints=constraints)] == expected
+
+        assert cfg.sweep(constraints=["max_heads > 10"]) == []
+
+    def test_sweep_constraints_wrong(self):
+
+        cfg = XConfig.from_dict({"a": "@sweep(1, 2)"})
+        for constraint in ["a > missing", "__import__('os')", "a >", 3]:
+            with pytest.raises(ValueError):
+                cfg.sweep(constraints=[constraint])
+
+        # Operators that could hang the sweep or exhaust memory are bounded
+        for constraint in [
+            "9**9**9 > a",
+            "(10**60)**60 > a",
+            "'x' * 10**9 != a",
+            "['x'] * 10**9 != a",
+            f"a * {'9' * 700} * {'9' * 700} > 0",
+            "1 << 10**12 > a",
+        ]:
+            with pytest.raises(ValueError):
+                cfg.sweep(constraints=[constraint])
+
+        assert [x.a for x in cfg.sweep(constraints=["a ** 2 < 2 ** 2"])] == [1]
+        assert [x.a for x in cfg.sweep(constraints=["a * 3 > 4", "1 << a == 4"])] == [2]
+        assert len(cfg.sweep(constraints=["'ab' * a != 'x'"])) == 2
+
+    def test_sweep_set(self, tmpdir):
+
+        root_cfg = {
+            "a": self._build_sweep([1, 2, 3]),
+            "b": {"c": '@sweep("x", [1, 2])', "big": list(range(100))},
+            "d": ["@sweep(True, False)", {"e": 0}],
+        }
+        cfg = XConfig.from_dict(root_cfg)
+        expected = [x.to_dict() for x in cfg.sweep()]
+
+        sweep_set = cfg.sweep_set()
+        assert len(sweep_set) == len(expected)
+        assert sweep_set.overrides(0) == {"a": 1, "b.c": "x", "d.0": True}
+        assert [x.to_dict() for x in sweep_set] == expected
+        assert sweep_set[-1].to_dict() == expected[-1]
+
+        filename = Path(tmpdir) / "sweep_set.jsonl"
+        sweep_set.save_to(filename)
+        assert len(filename.read_text().splitlines()) == len(expected) + 1
+
+        loaded = SweepSet.from_file(filename)
+        assert [x.to_dict() for x in loaded] == expected
+
+        # Overrides are copies, the set and the sweep options are not affected
+        sweep_set = cfg.sweep_set()
+        sweep_set.overrides(2)["b.c"].append(7)
+        assert sweep_set.overrides(2)["b.c"] == [1, 2]
+        assert [x.to_dict() for x in sweep_set] == expected
+        assert [x.to_dict() for x in cfg.sweep()] == expected
+
+        constrained = cfg.sweep_set(constraints=["a > 1"], shard=1, num_shards=2)
+        assert [x.to_dict() for x in constrained] == [
+            x for x in expected if x["a"] > 1
+        ][1::2]
+
+    def test_sweep_imports(self, tmpdir):
+
+        folder = Path(tmpdir)
+        (folder / "backbone.yml").write_text(
+            "depth: '@sweep(18, 34)'\nwidth: [64, 64]\n"
+        )
+        (folder / "head.yml").write_text("classes: 10\n")
+        (folder / "cfg.yml").write_text(
+            "model:\n"
+            "  backbone: '@import(backbone.yml)'\n"
+            '  head: \'@sweep("@import(head.yml)", "@import(backbone.yml)", 3)\'\n'
+            "lr: '@sweep(0.1, 0.01)'\n"
+        )
+
+        cfg = XConfig(folder / "cfg.yml")
+        keys = [".".join(k) for k, _ in cfg.sweep_sites()]
+        assert keys == ["model.backbone.depth", "model.head", "lr"]
+
+        sweeped_cfgs = cfg.sweep()
+        assert len(sweeped_cfgs) == 2 * (1 + 2 + 1) * 2
+        heads = [x.model.head for x in sweeped_cfgs[:8:2]]
+        assert heads[0] == {"classes": 10}
+        assert heads[1] == {"depth": 18, "width": [64, 64]}
+        assert heads[2] == {"depth": 34, "width": [64, 64]}
+        assert heads[3] == 3
+
+        # Imported options are not shared among variants
+        sweeped_cfgs[2].model.head.width.append(1)
+        assert sweeped_cfgs[10].model.head.width == [64, 64]
+        assert cfg.sweep_at(2).to_dict() == cfg.sweep()[2].to_dict()
+
+    def test_sweep_imports_lazy(self, tmpdir):
+
+        folder = Path(tmpdir)
+        (folder / "big.yml").write_text(
+            "a: '@sweep_range(0, 1000000)'\nb: '@sweep_range(0, 1000000)'\n"
+        )
+        (folder / "cfg.yml").write_text("m: '@sweep(0, \"@import(big.yml)\")'\n")
+
+        # Variants of imported files are built on demand
+        cfg = XConfig(folder / "cfg.yml")
+        assert cfg.sweep_length() == 1 + 10**12
+        assert cfg.sweep_at(-1).m == {"a": 999999, "b": 999999}
+        assert cfg.sweep_at(2).m == {"a": 0, "b": 1}
+
+        # Edited files are loaded again
+        (folder / "big.yml").write_text("a: '@sweep(7, 8)'\n")
+        stat = (folder / "big.yml").stat()
+        os.utime(folder / "big.yml", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert [x.m for x in cfg.sweep()] == [0, {"a": 7}, {"a": 8}]
+        assert _load_sweep_import.cache_info().maxsize is not None
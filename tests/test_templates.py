@@ -0,0 +1,93 @@
+import numpy as np
+from pathlib import Path
+import pytest
+from choixe.configurations import XConfig
+from choixe.templates import XConfigTemplate
+
+
+class TestTemplates:
+    def _sample_cfg(self):
+        return XConfig.from_dict(
+            {
+                "name": "@str(name)",
+                "size": "@int(size, default=3)",
+                "nested": {
+                    "ratio": "@float(ratio)",
+                    "items": [1, "@int(size)", {"flag": "@bool(flag)"}],
+                    "constant": {"big": list(range(100))},
+                },
+                "untouched": {"a": [1, 2, 3]},
+            }
+        )
+
+    @pytest.mark.parametrize("replace_defaults", [True, False])
+    def test_render(self, replace_defaults):
+
+        cfg = self._sample_cfg()
+        template = cfg.compile_template()
+        assert isinstance(template, XConfigTemplate)
+        assert template.names == {"name", "size", "ratio", "flag"}
+
+        for m in [
+            {"name": "a", "size": 1, "ratio": "0.5", "flag": True},
+            {"name": "b", "ratio": 2.0},
+            {},
+        ]:
+            expected = cfg.copy()
+            expected.replace_variables_map(m, replace_defaults=replace_defaults)
+
+            rendered = template.render(m, replace_defaults=replace_defaults)
+            assert isinstance(rendered, XConfig)
+            assert rendered.to_dict() == expected.to_dict()
+
+            plain = template.render(m, replace_defaults=replace_defaults, as_dict=True)
+            assert plain == expected.to_dict()
+
+        # The source configuration is not modified
+        assert cfg.to_dict() == self._sample_cfg().to_dict()
+
+    def test_render_sharing(self):
+
+        template = self._sample_cfg().compile_template()
+        first = template.render({"size": 1}, as_dict=True)
+        second = template.render({"size": 2}, as_dict=True)
+
+        assert first["untouched"] is second["untouched"]
+        assert first["nested"]["constant"] is second["nested"]["constant"]
+        assert first["nested"]["items"] is not second["nested"]["items"]
+        assert first["nested"]["items"][1] == 1 and second["nested"]["items"][1] == 2
+
+    def test_render_table(self, tmpdir):
+
+        cfg = self._sample_cfg()
+        template = cfg.compile_template()
+
+        rows = [
+            {"name": "a", "size": 1, "ratio": 0.5},
+            {"name": "b", "size": 2, "ratio": 1.5},
+            {"name": "c", "ratio": 2.5},
+        ]
+        for replace_defaults in [True, False]:
+            expected = []
+            for row in rows:
+                cfg_copy = cfg.copy()
+                cfg_copy.replace_variables_map(row, replace_defaults=replace_defaults)
+                expected.append(cfg_copy.to_dict())
+
+            rendered = template.render_table(rows, replace_defaults=replace_defaults)
+            assert [x.to_dict() for x in rendered] == expected
+
+        expected = [template.render(row, as_dict=True) for row in rows[:2]]
+
+        structured = np.array(
+            [("a", 1, 0.5), ("b", 2, 1.5)],
+            dtype=[("name", "U8"), ("size", "i4"), ("ratio", "f8")],
+        )
+        assert list(template.render_table(structured, as_dict=True)) == expected
+
+        filename = Path(tmpdir) / "table.csv"
+        filename.write_text("name,size,ratio,unused\na,1,0.5,x\nb,2,1.5,y\n")
+        assert list(template.render_table(filename, as_dict=True)) == expected
+
+        with pytest.raises(ValueError):
+            list(template.render_table(np.zeros(3)))